@@ -0,0 +1,192 @@
+# CarteiraCompartilhada.py
+
+"""
+Módulo responsável por compartilhar a carteira de empresas entre os workers da API.
+O processo pai grava a carteira uma única vez em formato colunar (Arrow IPC) na
+memória compartilhada do sistema, e cada worker a mapeia sem copiar os dados.
+Um contador de geração, também em memória compartilhada, permite trocar a carteira
+de todos os workers ao mesmo tempo.
+"""
+
+import json
+import logging
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from dataclasses import asdict, fields
+from typing import Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from Empresa import Empresa
+from Parses import CAMPOS_INTEIROS, RelatorioArquivo, RelatorioCarga
+
+# Variável de ambiente com o diretório da carteira compartilhada, herdada pelos workers.
+VARIAVEL_AMBIENTE = "CARTEIRA_COMPARTILHADA"
+
+_ARQUIVO_CONTROLE = "geracao"
+_FORMATO_GERACAO = "<Q"
+_CHAVE_RELATORIO = b"relatorio_carga"
+_TAMANHO_LOTE_ITERACAO = 4096
+
+ESQUEMA_CARTEIRA = pa.schema([
+    (f.name, pa.int64() if f.name in CAMPOS_INTEIROS else pa.string()) for f in fields(Empresa)
+])
+
+
+def _diretorio_base() -> str:
+    """Prefere /dev/shm (tmpfs), onde os arquivos mapeados ficam inteiramente em memória."""
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def _caminho_dados(diretorio: str, geracao: int) -> str:
+    return os.path.join(diretorio, f"carteira-{geracao}.arrow")
+
+
+class CarteiraColunar:
+    """
+    Visão somente-leitura da carteira sobre uma tabela Arrow mapeada em memória.
+
+    Se comporta como a lista de empresas usada pela API (len, iteração, índice),
+    mas cria os objetos Empresa apenas sob demanda, sem manter cópias no worker.
+    """
+
+    def __init__(self, tabela: pa.Table):
+        self.tabela = tabela
+        self._campos = [f.name for f in fields(Empresa)]
+
+    def __len__(self) -> int:
+        return self.tabela.num_rows
+
+    def __iter__(self) -> Iterator[Empresa]:
+        for lote in self.tabela.to_batches(max_chunksize=_TAMANHO_LOTE_ITERACAO):
+            colunas = [lote.column(campo).to_pylist() for campo in self._campos]
+            for valores in zip(*colunas):
+                yield Empresa(*valores)
+
+    def __getitem__(self, indice: int) -> Empresa:
+        if indice < 0:
+            indice += len(self)
+        linha = self.tabela.slice(indice, 1).to_pylist()
+        if not linha:
+            raise IndexError("índice fora da carteira")
+        return Empresa(**linha[0])
+
+    def buscar(self, nome: str) -> Optional[Empresa]:
+        """Busca uma empresa pelo nome exato, varrendo apenas a coluna 'nome'."""
+        indice = pc.index(self.tabela["nome"], nome).as_py()
+        return None if indice < 0 else self[indice]
+
+
+def tabela_de_empresas(empresas: List[Empresa], relatorio: Optional[RelatorioCarga] = None) -> pa.Table:
+    """
+    Converte a lista de empresas em uma tabela Arrow, uma coluna por campo da Empresa.
+
+    Args:
+        empresas (List[Empresa]): A carteira carregada pelos parsers.
+        relatorio (RelatorioCarga, optional): Guardado nos metadados da tabela para
+            que os workers possam expor o resumo da carga.
+
+    Returns:
+        pa.Table: A carteira em formato colunar.
+    """
+    colunas = {campo: [getattr(e, campo) for e in empresas] for campo in ESQUEMA_CARTEIRA.names}
+    esquema = ESQUEMA_CARTEIRA
+    if relatorio is not None:
+        esquema = esquema.with_metadata({_CHAVE_RELATORIO: json.dumps(asdict(relatorio))})
+    return pa.Table.from_pydict(colunas, schema=esquema)
+
+
+def relatorio_da_tabela(tabela: pa.Table) -> Optional[RelatorioCarga]:
+    """Recupera o RelatorioCarga gravado por `tabela_de_empresas`, se houver."""
+    metadados = tabela.schema.metadata or {}
+    if _CHAVE_RELATORIO not in metadados:
+        return None
+    dados = json.loads(metadados[_CHAVE_RELATORIO])
+    arquivos = [RelatorioArquivo(**arquivo) for arquivo in dados.pop("arquivos")]
+    return RelatorioCarga(arquivos=arquivos, **dados)
+
+
+class PublicadorCarteira:
+    """
+    Lado do processo pai: grava cada versão da carteira e incrementa a geração.
+
+    A versão anterior é mantida até a próxima publicação, para que um worker que
+    acabou de ler a geração ainda encontre o arquivo correspondente.
+    """
+
+    def __init__(self, diretorio: Optional[str] = None):
+        self.diretorio = diretorio or tempfile.mkdtemp(prefix="carteira-", dir=_diretorio_base())
+        caminho_controle = os.path.join(self.diretorio, _ARQUIVO_CONTROLE)
+        with open(caminho_controle, "wb") as arquivo:
+            arquivo.write(struct.pack(_FORMATO_GERACAO, 0))
+        self._arquivo_controle = open(caminho_controle, "r+b")
+        self._controle = mmap.mmap(self._arquivo_controle.fileno(), struct.calcsize(_FORMATO_GERACAO))
+        self.geracao = 0
+
+    def publicar(self, empresas: List[Empresa], relatorio: Optional[RelatorioCarga] = None) -> int:
+        """
+        Grava uma nova versão da carteira e a torna visível a todos os workers.
+
+        Returns:
+            int: A geração publicada.
+        """
+        nova_geracao = self.geracao + 1
+        tabela = tabela_de_empresas(empresas, relatorio)
+        caminho = _caminho_dados(self.diretorio, nova_geracao)
+        with pa.OSFile(caminho, "wb") as destino, pa.ipc.new_file(destino, tabela.schema) as escritor:
+            escritor.write_table(tabela)
+
+        # A troca é a escrita de um único inteiro alinhado: os workers veem a
+        # geração antiga ou a nova, nunca um estado intermediário.
+        struct.pack_into(_FORMATO_GERACAO, self._controle, 0, nova_geracao)
+
+        anterior = _caminho_dados(self.diretorio, self.geracao - 1)
+        if os.path.exists(anterior):
+            os.remove(anterior)  # Workers que ainda mapeiam o arquivo continuam acessando-o.
+        self.geracao = nova_geracao
+        logging.info(f"Carteira publicada: geração {nova_geracao}, {tabela.num_rows} empresas, "
+                     f"{tabela.nbytes / 1e6:.1f} MB em {self.diretorio}")
+        return nova_geracao
+
+    def encerrar(self):
+        """Libera o controle e remove todos os arquivos da carteira compartilhada."""
+        self._controle.close()
+        self._arquivo_controle.close()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+
+class LeitorCarteira:
+    """Lado do worker: mapeia a geração atual da carteira e detecta as trocas."""
+
+    def __init__(self, diretorio: str):
+        self.diretorio = diretorio
+        with open(os.path.join(diretorio, _ARQUIVO_CONTROLE), "rb") as arquivo:
+            self._controle = mmap.mmap(arquivo.fileno(), struct.calcsize(_FORMATO_GERACAO),
+                                       access=mmap.ACCESS_READ)
+        self.geracao = 0
+        self.carteira: Optional[CarteiraColunar] = None
+        self.relatorio: Optional[RelatorioCarga] = None
+
+    def geracao_publicada(self) -> int:
+        return struct.unpack_from(_FORMATO_GERACAO, self._controle, 0)[0]
+
+    def sincronizar(self) -> bool:
+        """
+        Mapeia a geração publicada, caso ela seja diferente da que o worker já usa.
+
+        Returns:
+            bool: True se a carteira foi trocada nesta chamada.
+        """
+        geracao = self.geracao_publicada()
+        if geracao == self.geracao or geracao == 0:
+            return False
+        # memory_map não copia os dados: as colunas apontam para as páginas compartilhadas.
+        tabela = pa.ipc.open_file(pa.memory_map(_caminho_dados(self.diretorio, geracao))).read_all()
+        self.carteira = CarteiraColunar(tabela)
+        self.relatorio = relatorio_da_tabela(tabela)
+        self.geracao = geracao
+        return True
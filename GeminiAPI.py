@@ -9,6 +9,7 @@ e processar a resposta da IA para gerar a análise de crédito.
 import os
 import google.generativeai as genai
 from dotenv import load_dotenv
+from typing import Any, Dict, Tuple
 from Empresa import Empresa as emp
 
 # --- Configuração Inicial ---
@@ -24,6 +25,54 @@ model = genai.GenerativeModel("gemini-2.5-flash")
 # model = genai.GenerativeModel("gemini-2.5-pro")
 
 
+def _formatar_dados(empresa: emp) -> str:
+    """
+    Formata os dados da empresa para o prompt.
+    Simplificamos os dados (sem R$, etc.) para evitar que a IA se confunda
+    ou gere artefatos de formatação indesejados.
+    """
+    return f"""
+    - Nome da Empresa: {empresa.nome}
+    - Setor de Atuacao: {empresa.setor}
+    - Receita Anual: {empresa.receita_anual}
+    - Divida Total: {empresa.divida_total}
+    - Prazo Medio de Pagamento: {empresa.prazo_pagamento} dias
+    - Rating de Credito Atual: {empresa.rating}
+    - Resumo de Noticias Recentes: "{empresa.noticias_recentes}"
+    """
+
+
+def _chamar_modelo(prompt: str, nome_empresa: str) -> str:
+    """
+    Envia o prompt à IA e trata bloqueios de segurança e falhas de comunicação.
+
+    Returns:
+        str: O texto gerado pela IA ou uma mensagem de erro iniciada por "ERRO".
+    """
+    try:
+        # Chamada para a API Generativa
+        response = model.generate_content(prompt)
+
+        # Tratamento de bloqueios de segurança da IA.
+        # Se response.parts estiver vazio, significa que a IA bloqueou a resposta
+        # por motivos de segurança (ex: política de conteúdo financeiro).
+        if not response.parts:
+            block_reason = "Nao especificado"
+            if response.prompt_feedback:
+                block_reason = response.prompt_feedback.block_reason.name
+            error_message = f"ERRO: A analise foi bloqueada pelo filtro de seguranca da IA. Motivo: {block_reason}."
+            print(f"!!! ANALISE BLOQUEADA. Motivo: {block_reason} !!!")
+            return error_message
+
+        print(f"INFO: Analise para {nome_empresa} gerada com sucesso.")
+        return response.text
+
+    except Exception as e:
+        error_message = f"ERRO INESPERADO: Falha na comunicacao com a API de IA. Detalhes: {str(e)}"
+        print(f"!!! ERRO NA API: {e} !!!")
+        return error_message
+
+
 def gerar_analise_de_credito(empresa: emp) -> str:
     """
     Gera uma análise de crédito textual para uma única empresa usando a IA Generativa.
@@ -43,17 +92,7 @@ def gerar_analise_de_credito(empresa: emp) -> str:
     """
     
     # 1. Formatação dos dados de entrada para o prompt.
-    # Simplificamos os dados (sem R$, etc.) para evitar que a IA se confunda
-    # ou gere artefatos de formatação indesejados.
-    dados_formatados = f"""
-    - Nome da Empresa: {empresa.nome}
-    - Setor de Atuacao: {empresa.setor}
-    - Receita Anual: {empresa.receita_anual}
-    - Divida Total: {empresa.divida_total}
-    - Prazo Medio de Pagamento: {empresa.prazo_pagamento} dias
-    - Rating de Credito Atual: {empresa.rating}
-    - Resumo de Noticias Recentes: "{empresa.noticias_recentes}"
-    """
+    dados_formatados = _formatar_dados(empresa)
 
     # 2. Construção do prompt com engenharia de prompt detalhada.
     # As instruções são explícitas para mitigar "alucinações" e forçar
@@ -81,26 +120,57 @@ def gerar_analise_de_credito(empresa: emp) -> str:
     """
     
     print(f"\nINFO: Gerando analise para {empresa.nome}...")
-    
-    try:
-        # 3. Chamada para a API Generativa
-        response = model.generate_content(prompt)
 
-        # 4. Tratamento de bloqueios de segurança da IA.
-        # Se response.parts estiver vazio, significa que a IA bloqueou a resposta
-        # por motivos de segurança (ex: política de conteúdo financeiro).
-        if not response.parts:
-            block_reason = "Nao especificado"
-            if response.prompt_feedback:
-                block_reason = response.prompt_feedback.block_reason.name
-            error_message = f"ERRO: A analise foi bloqueada pelo filtro de seguranca da IA. Motivo: {block_reason}."
-            print(f"!!! ANALISE BLOQUEADA. Motivo: {block_reason} !!!")
-            return error_message
+    # 3. e 4. Chamada à IA e tratamento de bloqueios de segurança (ver _chamar_modelo).
+    return _chamar_modelo(prompt, empresa.nome)
 
-        print(f"INFO: Analise para {empresa.nome} gerada com sucesso.")
-        return response.text
 
-    except Exception as e:
-        error_message = f"ERRO INESPERADO: Falha na comunicacao com a API de IA. Detalhes: {str(e)}"
-        print(f"!!! ERRO NA API: {e} !!!")
-        return error_message
\ No newline at end of file
+def gerar_analise_incremental(empresa: emp, analise_anterior: str, diferencas: Dict[str, Tuple[Any, Any]]) -> str:
+    """
+    Gera a análise de um cenário simulado a partir de uma análise já existente,
+    pedindo à IA que foque apenas no impacto do que mudou.
+
+    Usada quando o cenário cruza uma faixa de recomendação em relação à análise
+    de referência; o prompt é menor e a resposta mantém a continuidade do parecer.
+
+    Args:
+        empresa (emp.Empresa): Os dados do cenário simulado.
+        analise_anterior (str): A análise de referência (original ou de outro cenário).
+        diferencas (Dict[str, Tuple[Any, Any]]): Campos alterados, como (valor anterior, valor novo).
+
+    Returns:
+        str: A análise de crédito textual gerada pela IA ou uma mensagem de erro formatada.
+    """
+    mudancas = "\n".join(f"    - {campo}: de {antes} para {depois}" for campo, (antes, depois) in diferencas.items())
+
+    prompt = f"""
+    **Instrucoes Criticas:**
+    1.  Voce e um analista de credito senior. Sua resposta deve ser em **TEXTO PURO**.
+    2.  **NAO USE** formatacao Markdown (sem **, *, #, etc).
+    3.  **NAO USE** acentos ou caracteres especiais complexos (ex: ç, ´, ~). Escreva "aprovacao", "decisao", "credito".
+    4.  Baseie-se **APENAS** nos dados fornecidos abaixo.
+
+    **Parecer Anterior:**
+    {analise_anterior}
+
+    **O Que Mudou no Cenario Simulado:**
+{mudancas}
+
+    **Dados Atuais da Empresa:**
+    {_formatar_dados(empresa)}
+
+    **Tarefa de Analise:**
+    Revise o parecer anterior considerando apenas o impacto das mudancas listadas,
+    seguindo o formato abaixo:
+
+    Recomendacao Preliminar: (Escolha UMA: Aprovar Credito, Aprovar com Cautela, Recusar Credito).
+
+    Justificativa da Decisao: (Explique como as mudancas alteram a recomendacao em relacao ao parecer anterior).
+
+    Principais Pontos de Risco:
+    - (Liste o primeiro risco aqui).
+    - (Liste o segundo risco aqui).
+    """
+
+    print(f"\nINFO: Gerando analise incremental para {empresa.nome} ({len(diferencas)} campos alterados)...")
+    return _chamar_modelo(prompt, empresa.nome)
@@ -3,181 +3,494 @@
 """
 Módulo responsável pela ingestão e parsing de dados de empresas de diferentes formatos.
 Converte os dados brutos de arquivos CSV, JSON, XML e Parquet em uma lista padronizada
-de objetos Empresa.
+de objetos Empresa e, no sentido inverso, exporta registros de empresas em lote.
 """
 
 import csv
+import glob
+import io
+import itertools
 import json
+import os
+import time
 import xml.etree.ElementTree as ET
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import logging
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 import Empresa as emp  # Certifique-se que o arquivo Empresa.py está no mesmo diretório
 
 # Configuração de logging para registrar erros durante o parsing
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Mapeamento entre os campos da classe Empresa e os nomes de coluna usados nos
+# arquivos CSV, JSON e Parquet. É a mesma referência para importação e exportação.
+COLUNAS_ARQUIVO = {
+    "nome": "Empresa",
+    "receita_anual": "Receita Anual",
+    "divida_total": "Dívida Total",
+    "prazo_pagamento": "Prazo de Pagamento (dias)",
+    "setor": "Setor",
+    "rating": "Rating",
+    "noticias_recentes": "Notícias Recentes",
+}
+CAMPOS_INTEIROS = ("receita_anual", "divida_total", "prazo_pagamento")
+
+# No XML, os nomes de coluna viram tags sem espaços nem parênteses.
+TAGS_XML = {
+    "nome": "Empresa",
+    "receita_anual": "Receita_Anual",
+    "divida_total": "Dívida_Total",
+    "prazo_pagamento": "Prazo_de_Pagamento_dias",
+    "setor": "Setor",
+    "rating": "Rating",
+    "noticias_recentes": "Notícias_Recentes",
+}
+
+
+def registro_de_empresa(empresa: emp.Empresa) -> Dict[str, Any]:
+    """Gera o registro de uma empresa no layout de colunas dos arquivos (usado na exportação)."""
+    return {coluna: getattr(empresa, campo) for campo, coluna in COLUNAS_ARQUIVO.items()}
+
+
+# --- Validação Declarativa ---
+
+RATINGS_VALIDOS = frozenset({"A+", "A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D"})
+PRAZO_MAXIMO_DIAS = 365
+TAMANHO_BLOCO = 50000
+# Limite (exclusivo) do int64 como float, para barrar valores que não cabem na conversão final.
+_LIMITE_INT64 = 2.0 ** 63
+
+# Coluna auxiliar preenchida pelos leitores quando um registro nem chega a ser lido
+# (ex: linha JSON malformada). Não faz parte do layout dos arquivos.
+_COLUNA_ERRO_LEITURA = "_erro_leitura"
+
+
+@dataclass(frozen=True)
+class RegraColuna:
+    """Regra de validação aplicada de uma vez à coluna inteira de cada bloco lido."""
+    inteiro: bool = False
+    obrigatoria: bool = True
+    minimo: Optional[int] = None
+    maximo: Optional[int] = None
+    valores_permitidos: Optional[frozenset] = None
+
+
+# Regras por campo da classe Empresa. Cada violação gera um código de motivo
+# no formato "<regra>:<campo>" (ex: "minimo:divida_total", "dominio:rating").
+REGRAS_VALIDACAO: Dict[str, RegraColuna] = {
+    "nome": RegraColuna(),
+    "receita_anual": RegraColuna(inteiro=True, minimo=0),
+    "divida_total": RegraColuna(inteiro=True, minimo=0),
+    "prazo_pagamento": RegraColuna(inteiro=True, minimo=0, maximo=PRAZO_MAXIMO_DIAS),
+    "setor": RegraColuna(),
+    "rating": RegraColuna(valores_permitidos=RATINGS_VALIDOS),
+    "noticias_recentes": RegraColuna(obrigatoria=False),
+}
+
+
+@dataclass
+class RelatorioArquivo:
+    """Resultado do carregamento e da validação de um único arquivo."""
+    caminho: str
+    registros: int = 0
+    rejeitados: int = 0
+    motivos: Dict[str, int] = field(default_factory=dict)
+    caminho_rejeitados: Optional[str] = None
+    tempo_segundos: float = 0.0
+    erro: Optional[str] = None
+
+
+def _inteiros_de_texto(texto: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Converte texto, já sem espaços nas pontas, em inteiros com as mesmas regras do int()
+    do Python: só aceita números escritos como inteiros ("30", e não "30.0" nem "1e5"),
+    e que caibam em int64.
+
+    Returns:
+        Tuple[pd.Series, pd.Series]: Os números (0 nas posições inválidas) e a máscara das inválidas.
+    """
+    validos = texto.str.fullmatch(r"[+-]?\d+").fillna(False).astype(bool)
+    # Com até 18 caracteres o número sempre cabe em int64; os mais longos são conferidos um a um.
+    longos = validos & (texto.str.len() > 18)
+    if longos.any():
+        limites = np.iinfo(np.int64)
+        validos[longos] = [limites.min <= int(t) <= limites.max for t in texto[longos]]
+    # O cast do Arrow converte o texto já conferido sem passar por float; só não aceita o sinal '+'.
+    numeros = pa.array(texto.where(validos, "0").str.removeprefix("+")).cast(pa.int64())
+    return pd.Series(numeros.to_numpy(), index=texto.index), ~validos
+
+
+def validar_bloco(bloco: pd.DataFrame,
+                  regras: Dict[str, RegraColuna] = REGRAS_VALIDACAO) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Aplica as regras de validação coluna a coluna sobre um bloco de registros brutos.
+
+    Args:
+        bloco (pd.DataFrame): Registros com os nomes de coluna dos arquivos (COLUNAS_ARQUIVO).
+        regras (Dict[str, RegraColuna], optional): Regras por campo. Default é REGRAS_VALIDACAO.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.Series]: As linhas válidas, já com os nomes e tipos dos
+        campos da Empresa, e os motivos de rejeição (separados por ';') das demais,
+        ambos indexados pela posição original do registro no arquivo.
+    """
+    motivos = pd.Series("", index=bloco.index, dtype=object)
+
+    def anotar(mascara: pd.Series, codigo: str):
+        nonlocal motivos
+        if mascara.any():
+            motivos = motivos.mask(mascara, motivos + codigo + ";")
+
+    campos = {}
+    for campo, regra in regras.items():
+        coluna = COLUNAS_ARQUIVO[campo]
+        valores = bloco[coluna] if coluna in bloco else pd.Series(None, index=bloco.index, dtype=object)
+        ausente = valores.isna()
+        # Texto em branco conta como ausente; colunas já numéricas dispensam a checagem.
+        texto = None
+        if not pd.api.types.is_numeric_dtype(valores) and (regra.obrigatoria or regra.inteiro):
+            texto = valores.astype(str).str.strip()
+            ausente |= texto == ""
+
+        if regra.obrigatoria:
+            anotar(ausente, f"ausente:{campo}")
+        else:
+            valores = valores.where(~ausente, "")
+
+        if regra.inteiro:
+            if pd.api.types.is_integer_dtype(valores):
+                numeros = valores
+            elif pd.api.types.is_numeric_dtype(valores):
+                # Fora do int64, o valor mudaria de sinal na conversão final.
+                numeros = valores
+                anotar(~ausente & (numeros.isna() | (numeros % 1 != 0) | (numeros.abs() >= _LIMITE_INT64)),
+                       f"tipo:{campo}")
+            else:
+                numeros, invalidos = _inteiros_de_texto(texto)
+                anotar(~ausente & invalidos, f"tipo:{campo}")
+            if regra.minimo is not None:
+                anotar(numeros < regra.minimo, f"minimo:{campo}")
+            if regra.maximo is not None:
+                anotar(numeros > regra.maximo, f"maximo:{campo}")
+            valores = numeros
+
+        if regra.valores_permitidos is not None:
+            anotar(~ausente & ~valores.isin(regra.valores_permitidos), f"dominio:{campo}")
+        campos[campo] = valores
+
+    # Um registro que nem foi lido direito não tem campos a validar: fica só o erro de leitura.
+    if _COLUNA_ERRO_LEITURA in bloco:
+        motivos = motivos.mask(bloco[_COLUNA_ERRO_LEITURA].notna(), "leitura;")
+
+    rejeitados = motivos != ""
+    validos = pd.DataFrame(campos)[~rejeitados]
+    for campo, regra in regras.items():
+        if regra.inteiro:
+            validos[campo] = validos[campo].astype("int64")
+    return validos, motivos[rejeitados].str.rstrip(";")
+
+
+def _empresas_do_bloco(validos: pd.DataFrame) -> List[emp.Empresa]:
+    """Converte as linhas validadas em objetos Empresa, uma coluna de cada vez."""
+    colunas = [validos[f.name].tolist() for f in fields(emp.Empresa)]
+    return [emp.Empresa(*valores) for valores in zip(*colunas)]
+
+
+def _registrar_rejeitados(bloco: pd.DataFrame, motivos: pd.Series, relatorio: RelatorioArquivo,
+                          caminho_rejeitados: Optional[str]):
+    """Contabiliza os motivos de rejeição e acrescenta as linhas ao arquivo de rejeitados."""
+    relatorio.rejeitados += len(motivos)
+    for codigo, quantidade in motivos.str.split(";").explode().value_counts().items():
+        relatorio.motivos[codigo] = relatorio.motivos.get(codigo, 0) + int(quantidade)
+
+    if caminho_rejeitados:
+        saida = bloco.loc[motivos.index].drop(columns=[_COLUNA_ERRO_LEITURA], errors="ignore")
+        saida.insert(0, "motivo", motivos)
+        saida.insert(0, "linha", motivos.index + 1)
+        primeiro_bloco = relatorio.caminho_rejeitados is None
+        saida.to_csv(caminho_rejeitados, mode="w" if primeiro_bloco else "a", header=primeiro_bloco,
+                     index=False, encoding="utf-8")
+        relatorio.caminho_rejeitados = caminho_rejeitados
+
+
+def _validar_blocos(blocos: Iterable[pd.DataFrame], relatorio: RelatorioArquivo,
+                    caminho_rejeitados: Optional[str]) -> pd.DataFrame:
+    """Valida cada bloco lido e acumula as linhas válidas. Etapa comum a todos os formatos."""
+    if caminho_rejeitados and os.path.exists(caminho_rejeitados):
+        os.remove(caminho_rejeitados)  # Evita misturar rejeitados de uma carga anterior.
+
+    partes = []
+    for bloco in blocos:
+        validos, motivos = validar_bloco(bloco)
+        partes.append(validos)
+        if len(motivos):
+            _registrar_rejeitados(bloco, motivos, relatorio, caminho_rejeitados)
+    validos = pd.concat(partes) if partes else pd.DataFrame(columns=[f.name for f in fields(emp.Empresa)])
+    relatorio.registros += len(validos)
+
+    # Um único aviso por arquivo, em vez de uma linha de log por registro descartado.
+    if relatorio.rejeitados:
+        destino = f" Detalhes em: {relatorio.caminho_rejeitados}" if relatorio.caminho_rejeitados else ""
+        logging.warning(f"{relatorio.rejeitados} linhas rejeitadas em {relatorio.caminho}: {relatorio.motivos}.{destino}")
+    return validos
+
+
+def _carregar_blocos(blocos: Iterable[pd.DataFrame], relatorio: RelatorioArquivo,
+                     caminho_rejeitados: Optional[str]) -> List[emp.Empresa]:
+    """Valida os blocos lidos e converte as linhas válidas em objetos Empresa."""
+    return _empresas_do_bloco(_validar_blocos(blocos, relatorio, caminho_rejeitados))
+
+
+def _csv_bem_formado(caminho_arquivo: str, largura: int) -> bool:
+    """
+    Confere, sem interpretar os campos, se todas as linhas do arquivo têm `largura`
+    campos: sem aspas, cada linha tem exatamente `largura - 1` vírgulas.
+    """
+    virgulas = quebras = 0
+    ultimo = b"\n"
+    with open(caminho_arquivo, mode='rb') as arquivo:
+        for pedaco in iter(lambda: arquivo.read(1 << 22), b""):
+            if b'"' in pedaco:
+                return False
+            virgulas += pedaco.count(b",")
+            quebras += pedaco.count(b"\n")
+            ultimo = pedaco[-1:]
+    linhas = quebras + (ultimo != b"\n")
+    return virgulas == (largura - 1) * linhas
+
+
+def _registros_malformados(arquivo_csv, largura: int) -> Tuple[Dict[int, int], List[List[str]], int]:
+    """
+    Varre o CSV, já posicionado após o cabeçalho, atrás dos registros com quantidade
+    de campos diferente de `largura`.
+
+    Returns:
+        Tuple[Dict[int, int], List[List[str]], int]: A posição no arquivo de cada registro
+        malformado, pela linha contada pelo parser do pandas (o cabeçalho é a 0); os campos
+        lidos desses registros; e o total de registros do arquivo.
+    """
+    malformados, campos_malformados, posicao = {}, [], 0
+    for linha, campos in enumerate(csv.reader(arquivo_csv), start=1):
+        if not campos:
+            continue  # Linha em branco: ignorada também pelo parser do pandas.
+        if len(campos) != largura:
+            malformados[linha] = posicao
+            campos_malformados.append(campos)
+        posicao += 1
+    return malformados, campos_malformados, posicao
+
+
+def _blocos_csv(caminho_arquivo: str, tamanho_bloco: int) -> Iterator[pd.DataFrame]:
+    with open(caminho_arquivo, mode='r', encoding='utf-8', newline='') as arquivo_csv:
+        cabecalho = arquivo_csv.readline()
+        if not cabecalho.strip():
+            return  # Arquivo vazio: nenhum registro.
+        colunas = next(csv.reader([cabecalho]))
+        largura = len(colunas)
+
+        # O parser em C interrompe o arquivo em registros com campos a mais e completa em
+        # silêncio os com campos a menos. Quando a varredura rápida não garante que não há
+        # nenhum deles, o csv do Python localiza esses registros, que são pulados pelo
+        # parser e entregues à validação como erro de leitura.
+        malformados, campos_malformados, total = {}, [], 0
+        if not _csv_bem_formado(caminho_arquivo, largura):
+            malformados, campos_malformados, total = _registros_malformados(arquivo_csv, largura)
+
+    posicoes_validas = None
+    if malformados:
+        posicoes = list(malformados.values())
+        for inicio in range(0, len(posicoes), tamanho_bloco):
+            lote = campos_malformados[inicio:inicio + tamanho_bloco]
+            bloco = pd.DataFrame([(campos + [""] * largura)[:largura] for campos in lote], columns=colunas,
+                                 index=posicoes[inicio:inicio + tamanho_bloco], dtype=object)
+            bloco[_COLUNA_ERRO_LEITURA] = "leitura"
+            yield bloco
+        posicoes_validas = np.delete(np.arange(total), posicoes)
+
+    # Todas as colunas são lidas como texto: o parser do pandas aceitaria "30.0" ou "1e5"
+    # como número, e a conversão dos inteiros fica a cargo de validar_bloco.
+    tipos = {coluna: str for coluna in COLUNAS_ARQUIVO.values()}
+    with pd.read_csv(caminho_arquivo, dtype=tipos, keep_default_na=False, chunksize=tamanho_bloco,
+                     encoding='utf-8', skiprows=set(malformados) or None) as leitor:
+        inicio = 0
+        for bloco in leitor:
+            if posicoes_validas is not None:
+                bloco.index = posicoes_validas[inicio:inicio + len(bloco)]
+            inicio += len(bloco)
+            yield bloco
+
+
+def _blocos_json(caminho_arquivo: str, tamanho_bloco: int) -> Iterator[pd.DataFrame]:
+    registros, indices = [], []
+    with open(caminho_arquivo, mode='r', encoding='utf-8') as arquivo_json:
+        for i, linha_json in enumerate(arquivo_json):
+            try:
+                dados = json.loads(linha_json)
+                if not isinstance(dados, dict):
+                    raise ValueError("registro não é um objeto JSON")
+            except ValueError:
+                dados = {_COLUNA_ERRO_LEITURA: "json_invalido"}
+            registros.append(dados)
+            indices.append(i)
+            if len(registros) >= tamanho_bloco:
+                yield pd.DataFrame(registros, index=indices)
+                registros, indices = [], []
+    if registros:
+        yield pd.DataFrame(registros, index=indices)
+
+
+def _blocos_xml(caminho_arquivo: str, tamanho_bloco: int) -> Iterator[pd.DataFrame]:
+    coluna_por_tag = {tag: COLUNAS_ARQUIVO[campo] for campo, tag in TAGS_XML.items()}
+    registros, inicio = [], 0
+    for _, elemento in ET.iterparse(caminho_arquivo):
+        if elemento.tag != "row":
+            continue
+        registros.append({coluna_por_tag.get(filho.tag, filho.tag): filho.text for filho in elemento})
+        elemento.clear()
+        if len(registros) >= tamanho_bloco:
+            yield pd.DataFrame(registros, index=pd.RangeIndex(inicio, inicio + len(registros)))
+            inicio += len(registros)
+            registros = []
+    if registros:
+        yield pd.DataFrame(registros, index=pd.RangeIndex(inicio, inicio + len(registros)))
+
+
+def _blocos_parquet(caminho_arquivo: str, tamanho_bloco: int) -> Iterator[pd.DataFrame]:
+    inicio = 0
+    for lote in pq.ParquetFile(caminho_arquivo).iter_batches(batch_size=tamanho_bloco):
+        bloco = lote.to_pandas()
+        bloco.index = pd.RangeIndex(inicio, inicio + len(bloco))
+        inicio += len(bloco)
+        yield bloco
+
+
+# Leitor em blocos de cada extensão aceita. É a única referência dos formatos suportados,
+# usada pelo despachante e pela carga multi-fonte.
+_LEITORES_DE_BLOCOS = {
+    'csv': _blocos_csv,
+    'json': _blocos_json,
+    'ndjson': _blocos_json,
+    'xml': _blocos_xml,
+    'parquet': _blocos_parquet,
+}
+FORMATOS_SUPORTADOS = tuple(_LEITORES_DE_BLOCOS)
+
+
+def _leitor_de_blocos(caminho_arquivo: str):
+    """Identifica o formato pela extensão e retorna o leitor em blocos correspondente."""
+    extensao = caminho_arquivo.lower().split('.')[-1]
+    if extensao not in _LEITORES_DE_BLOCOS:
+        raise ValueError(f"Formato de arquivo não suportado: {extensao}")
+    return _LEITORES_DE_BLOCOS[extensao]
 
-def carregar_dados_csv(caminho_arquivo: str) -> List[emp.Empresa]:
+
+def carregar_dados_csv(caminho_arquivo: str, relatorio: Optional[RelatorioArquivo] = None,
+                       caminho_rejeitados: Optional[str] = None) -> List[emp.Empresa]:
     """
     Carrega dados de um arquivo CSV e converte para uma lista de objetos Empresa.
 
     Args:
         caminho_arquivo (str): O caminho completo para o arquivo .csv.
+        relatorio (RelatorioArquivo, optional): Se informado, recebe as contagens e os motivos de rejeição.
+        caminho_rejeitados (str, optional): Se informado, grava ali as linhas rejeitadas com o motivo.
 
     Returns:
         List[emp.Empresa]: Uma lista de instâncias da classe Empresa.
     """
-    empresas = []
+    relatorio = relatorio or RelatorioArquivo(caminho=caminho_arquivo)
     try:
-        with open(caminho_arquivo, mode='r', encoding='utf-8') as arquivo_csv:
-            leitor = csv.DictReader(arquivo_csv)
-            for i, linha in enumerate(leitor):
-                try:
-                    empresa = emp.Empresa(
-                        nome=linha["Empresa"],
-                        receita_anual=int(linha["Receita Anual"]),
-                        divida_total=int(linha["Dívida Total"]),
-                        prazo_pagamento=int(linha["Prazo de Pagamento (dias)"]),
-                        setor=linha["Setor"],
-                        rating=linha["Rating"],
-                        noticias_recentes=linha["Notícias Recentes"]
-                    )
-                    empresas.append(empresa)
-                except ValueError as e:
-                    logging.warning(f"Erro ao processar linha {i+1} do CSV: {e}. Linha ignorada: {linha}")
-                except KeyError as e:
-                    logging.warning(f"Coluna esperada não encontrada na linha {i+1} do CSV: {e}. Linha ignorada.")
-
+        return _carregar_blocos(_blocos_csv(caminho_arquivo, TAMANHO_BLOCO), relatorio, caminho_rejeitados)
     except FileNotFoundError:
         logging.error(f"Arquivo CSV não encontrado em: {caminho_arquivo}")
         raise
-    return empresas
 
 
-def carregar_dados_json(caminho_arquivo: str) -> List[emp.Empresa]:
+def carregar_dados_json(caminho_arquivo: str, relatorio: Optional[RelatorioArquivo] = None,
+                        caminho_rejeitados: Optional[str] = None) -> List[emp.Empresa]:
     """
     Carrega dados de um arquivo JSON (JSON Lines) e converte para uma lista de objetos Empresa.
 
     Args:
-        caminho_arquivo (str): O caminho completo para o arquivo .json.
+        caminho_arquivo (str): O caminho completo para o arquivo .json ou .ndjson.
+        relatorio (RelatorioArquivo, optional): Se informado, recebe as contagens e os motivos de rejeição.
+        caminho_rejeitados (str, optional): Se informado, grava ali as linhas rejeitadas com o motivo.
 
     Returns:
         List[emp.Empresa]: Uma lista de instâncias da classe Empresa.
     """
-    empresas = []
+    relatorio = relatorio or RelatorioArquivo(caminho=caminho_arquivo)
     try:
-        with open(caminho_arquivo, mode='r', encoding='utf-8') as arquivo_json:
-            for i, linha_json in enumerate(arquivo_json):
-                try:
-                    dados = json.loads(linha_json)
-                    empresa = emp.Empresa(
-                        nome=dados["Empresa"],
-                        receita_anual=int(dados["Receita Anual"]),
-                        divida_total=int(dados["Dívida Total"]),
-                        prazo_pagamento=int(dados["Prazo de Pagamento (dias)"]),
-                        setor=dados["Setor"],
-                        rating=dados["Rating"],
-                        noticias_recentes=dados["Notícias Recentes"]
-                    )
-                    empresas.append(empresa)
-                except ValueError as e:
-                    logging.warning(f"Erro de conversão de tipo na linha {i+1} do JSON: {e}. Linha ignorada: {dados}")
-                except KeyError as e:
-                    logging.warning(f"Chave esperada não encontrada na linha {i+1} do JSON: {e}. Linha ignorada.")
-
+        return _carregar_blocos(_blocos_json(caminho_arquivo, TAMANHO_BLOCO), relatorio, caminho_rejeitados)
     except FileNotFoundError:
         logging.error(f"Arquivo JSON não encontrado em: {caminho_arquivo}")
         raise
-    return empresas
 
 
-def carregar_dados_xml(caminho_arquivo: str) -> List[emp.Empresa]:
+def carregar_dados_xml(caminho_arquivo: str, relatorio: Optional[RelatorioArquivo] = None,
+                       caminho_rejeitados: Optional[str] = None) -> List[emp.Empresa]:
     """
     Carrega dados de um arquivo XML e converte para uma lista de objetos Empresa.
 
     Args:
         caminho_arquivo (str): O caminho completo para o arquivo .xml.
+        relatorio (RelatorioArquivo, optional): Se informado, recebe as contagens e os motivos de rejeição.
+        caminho_rejeitados (str, optional): Se informado, grava ali as linhas rejeitadas com o motivo.
 
     Returns:
         List[emp.Empresa]: Uma lista de instâncias da classe Empresa.
     """
-    empresas = []
+    relatorio = relatorio or RelatorioArquivo(caminho=caminho_arquivo)
     try:
-        tree = ET.parse(caminho_arquivo)
-        root = tree.getroot()
-        
-        for i, row in enumerate(root.findall("row")):
-            try:
-                empresa = emp.Empresa(
-                    nome=row.find("Empresa").text,
-                    receita_anual=int(row.find("Receita_Anual").text),
-                    divida_total=int(row.find("Dívida_Total").text),
-                    prazo_pagamento=int(row.find("Prazo_de_Pagamento_dias").text),
-                    setor=row.find("Setor").text,
-                    rating=row.find("Rating").text,
-                    noticias_recentes=row.find("Notícias_Recentes").text
-                )
-                empresas.append(empresa)
-            except (ValueError, AttributeError) as e:
-                logging.warning(f"Erro ao processar nó XML {i+1}: {e}. Nó ignorado.")
-
+        return _carregar_blocos(_blocos_xml(caminho_arquivo, TAMANHO_BLOCO), relatorio, caminho_rejeitados)
     except ET.ParseError:
         logging.error(f"Erro ao fazer o parse do arquivo XML: {caminho_arquivo}")
         raise
     except FileNotFoundError:
         logging.error(f"Arquivo XML não encontrado em: {caminho_arquivo}")
         raise
-    return empresas
 
 
-def carregar_dados_parquet(caminho_arquivo: str) -> List[emp.Empresa]:
+def carregar_dados_parquet(caminho_arquivo: str, relatorio: Optional[RelatorioArquivo] = None,
+                           caminho_rejeitados: Optional[str] = None) -> List[emp.Empresa]:
     """
     Carrega dados de um arquivo Parquet e converte para uma lista de objetos Empresa.
 
     Args:
         caminho_arquivo (str): O caminho completo para o arquivo .parquet.
+        relatorio (RelatorioArquivo, optional): Se informado, recebe as contagens e os motivos de rejeição.
+        caminho_rejeitados (str, optional): Se informado, grava ali as linhas rejeitadas com o motivo.
 
     Returns:
         List[emp.Empresa]: Uma lista de instâncias da classe Empresa.
     """
-    empresas = []
+    relatorio = relatorio or RelatorioArquivo(caminho=caminho_arquivo)
     try:
-        df = pd.read_parquet(caminho_arquivo)
-        for i, linha in df.iterrows():
-            try:
-                empresa = emp.Empresa(
-                    nome=linha["Empresa"],
-                    receita_anual=int(linha["Receita Anual"]),
-                    divida_total=int(linha["Dívida Total"]),
-                    prazo_pagamento=int(linha["Prazo de Pagamento (dias)"]),
-                    setor=linha["Setor"],
-                    rating=linha["Rating"],
-                    noticias_recentes=linha["Notícias Recentes"]
-                )
-                empresas.append(empresa)
-            except (ValueError, TypeError) as e:
-                logging.warning(f"Erro de conversão de tipo na linha {i} do Parquet: {e}. Linha ignorada.")
-            except KeyError as e:
-                logging.warning(f"Coluna esperada não encontrada no Parquet: {e}.")
-
+        return _carregar_blocos(_blocos_parquet(caminho_arquivo, TAMANHO_BLOCO), relatorio, caminho_rejeitados)
     except FileNotFoundError:
         logging.error(f"Arquivo Parquet não encontrado em: {caminho_arquivo}")
         raise
-    return empresas
 
 
-def carregar_dados_de_arquivo(caminho_do_arquivo: str, debug: bool = False) -> List[emp.Empresa]:
+def carregar_dados_de_arquivo(caminho_do_arquivo: str, debug: bool = False,
+                              relatorio: Optional[RelatorioArquivo] = None,
+                              caminho_rejeitados: Optional[str] = None) -> List[emp.Empresa]:
     """
     Função despachante que identifica o formato do arquivo pela extensão
-    e chama o parser apropriado.
+    e lê o arquivo com o leitor correspondente (ver `_LEITORES_DE_BLOCOS`).
 
     Args:
         caminho_do_arquivo (str): O caminho para o arquivo de dados.
         debug (bool, optional): Se True, imprime logs de informação. Default é False.
+        relatorio (RelatorioArquivo, optional): Repassado ao parser para registrar as rejeições.
+        caminho_rejeitados (str, optional): Arquivo CSV onde o parser grava as linhas rejeitadas.
 
     Raises:
-        ValueError: Se a extensão do arquivo não for suportada (.csv, .json, .xml, .parquet).
+        ValueError: Se a extensão do arquivo não for suportada (.csv, .json, .ndjson, .xml, .parquet).
 
     Returns:
         List[emp.Empresa]: A lista de empresas carregada do arquivo.
@@ -186,16 +499,412 @@ def carregar_dados_de_arquivo(caminho_do_arquivo: str, debug: bool = False) -> L
     if debug:
         logging.info(f"Tentando carregar arquivo: {caminho_do_arquivo} (Extensão detectada: {extensao})")
 
-    if extensao == 'csv':
-        return carregar_dados_csv(caminho_do_arquivo)
-    elif extensao == 'json':
-        return carregar_dados_json(caminho_do_arquivo)
-    elif extensao == 'xml':
-        return carregar_dados_xml(caminho_do_arquivo)
-    elif extensao == 'parquet':
-        return carregar_dados_parquet(caminho_do_arquivo)
+    leitor = _leitor_de_blocos(caminho_do_arquivo)
+    relatorio = relatorio or RelatorioArquivo(caminho=caminho_do_arquivo)
+    try:
+        return _carregar_blocos(leitor(caminho_do_arquivo, TAMANHO_BLOCO), relatorio, caminho_rejeitados)
+    except ET.ParseError:
+        logging.error(f"Erro ao fazer o parse do arquivo XML: {caminho_do_arquivo}")
+        raise
+    except FileNotFoundError:
+        logging.error(f"Arquivo não encontrado em: {caminho_do_arquivo}")
+        raise
+
+
+# --- Ingestão de Múltiplas Fontes ---
+
+# Origem e destino padrão da carga da API, sobrescritos por CAMINHO_DADOS e DIRETORIO_REJEITADOS.
+CAMINHO_DADOS_PADRAO = 'dados/dadoscreditoficticios.csv'
+DIRETORIO_REJEITADOS_PADRAO = 'dados/rejeitados'
+# Resolução de nomes repetidos na carga da API, sobrescrita por RESOLUCAO_DUPLICADOS.
+RESOLUCAO_PADRAO = 'ultima'
+
+
+@dataclass
+class RelatorioCarga:
+    """Resumo consolidado de uma carga multi-fonte, após a deduplicação por nome."""
+    arquivos: List[RelatorioArquivo] = field(default_factory=list)
+    total_registros: int = 0
+    duplicados: int = 0
+    conflitos: int = 0
+    tempo_total_segundos: float = 0.0
+    tempo_consolidacao_segundos: float = 0.0
+
+
+def listar_fontes(origem: str) -> List[str]:
+    """
+    Resolve a origem dos dados em uma lista ordenada de arquivos suportados.
+
+    Args:
+        origem (str): Um arquivo, um diretório ou um padrão glob (ex: 'dados/*.csv').
+
+    Raises:
+        FileNotFoundError: Se nenhum arquivo suportado for encontrado na origem.
+
+    Returns:
+        List[str]: Os caminhos dos arquivos, em ordem alfabética.
+    """
+    if os.path.isdir(origem):
+        candidatos = [os.path.join(origem, nome) for nome in os.listdir(origem)]
+    elif glob.has_magic(origem):
+        candidatos = glob.glob(origem)
+    elif os.path.isfile(origem):
+        return [origem]
     else:
-        raise ValueError(f"Formato de arquivo não suportado: {extensao}")
+        raise FileNotFoundError(f"Arquivo de dados não encontrado em: {origem}")
+
+    fontes = sorted(c for c in candidatos
+                    if os.path.isfile(c) and c.lower().split('.')[-1] in FORMATOS_SUPORTADOS)
+    if not fontes:
+        raise FileNotFoundError(f"Nenhum arquivo suportado encontrado em: {origem}")
+    return fontes
+
+
+def _carregar_arquivo_com_relatorio(caminho_arquivo: str,
+                                    diretorio_rejeitados: Optional[str]) -> Tuple[Optional[pd.DataFrame], RelatorioArquivo]:
+    """
+    Executada em um processo do pool: lê e valida um arquivo, medindo tempo e rejeições.
+
+    Devolve as linhas válidas em formato colunar, e não objetos Empresa, pois um
+    DataFrame atravessa a fronteira entre processos muito mais barato que uma lista
+    de objetos. Se o arquivo falhar, o erro fica no relatório e nenhum dado é devolvido.
+    """
+    relatorio = RelatorioArquivo(caminho=caminho_arquivo)
+    caminho_rejeitados = None
+    if diretorio_rejeitados:
+        caminho_rejeitados = os.path.join(diretorio_rejeitados, os.path.basename(caminho_arquivo) + ".rejeitados.csv")
+    inicio = time.perf_counter()
+    validos = None
+    try:
+        blocos = _leitor_de_blocos(caminho_arquivo)(caminho_arquivo, TAMANHO_BLOCO)
+        validos = _validar_blocos(blocos, relatorio, caminho_rejeitados)
+    except Exception as e:
+        relatorio.erro = f"{type(e).__name__}: {e}"
+        logging.error(f"Arquivo ignorado na carga: {caminho_arquivo}. {relatorio.erro}")
+    relatorio.tempo_segundos = time.perf_counter() - inicio
+    return validos, relatorio
+
+
+def _prioridade_da_fonte(caminho_arquivo: str, prioridades: Dict[str, int]) -> int:
+    """Busca a prioridade pelo nome do arquivo e, em seguida, pela extensão. Default é 0."""
+    nome_arquivo = os.path.basename(caminho_arquivo)
+    if nome_arquivo in prioridades:
+        return prioridades[nome_arquivo]
+    return prioridades.get(nome_arquivo.lower().split('.')[-1], 0)
+
+
+def carregar_dados_de_multiplas_fontes(origem: str,
+                                       resolucao: str = 'ultima',
+                                       prioridades: Optional[Dict[str, int]] = None,
+                                       max_processos: Optional[int] = None,
+                                       diretorio_rejeitados: Optional[str] = None) -> Tuple[List[emp.Empresa], RelatorioCarga]:
+    """
+    Carrega todos os arquivos de um diretório ou padrão glob em paralelo e
+    consolida o resultado em uma única lista de empresas, sem nomes repetidos.
+
+    Cada arquivo é lido e validado em um processo separado, que devolve apenas as
+    linhas válidas em formato colunar; a deduplicação é feita sobre as colunas e os
+    objetos Empresa são criados uma única vez, já sem repetidos. Um arquivo que falhe
+    é ignorado, com o erro registrado em `RelatorioArquivo.erro`, e os demais seguem.
+    Quando a mesma empresa (`nome`) aparece em mais de uma fonte, o conflito é
+    resolvido pela estratégia escolhida:
+    - 'ultima': vence o último registro lido, na ordem alfabética dos arquivos.
+    - 'prioridade': vence a fonte de maior prioridade; em caso de empate, a última.
+
+    Args:
+        origem (str): Um arquivo, um diretório ou um padrão glob.
+        resolucao (str, optional): 'ultima' ou 'prioridade'. Default é 'ultima'.
+        prioridades (Dict[str, int], optional): Prioridade por nome de arquivo ou
+            por extensão (ex: {"parquet": 2, "csv": 1}). Usado com resolucao='prioridade'.
+        max_processos (int, optional): Limite de processos do pool. Default é o número de CPUs.
+        diretorio_rejeitados (str, optional): Se informado, cada arquivo com linhas inválidas
+            gera ali um '<arquivo>.rejeitados.csv' com a linha original e o motivo.
+
+    Raises:
+        ValueError: Se a estratégia de resolução não for reconhecida.
+        FileNotFoundError: Se a origem não contiver arquivos suportados.
+
+    Returns:
+        Tuple[List[emp.Empresa], RelatorioCarga]: As empresas consolidadas e o relatório da carga.
+    """
+    if resolucao not in ('ultima', 'prioridade'):
+        raise ValueError(f"Estratégia de resolução não suportada: {resolucao}")
+    prioridades = prioridades or {}
+
+    inicio = time.perf_counter()
+    fontes = listar_fontes(origem)
+    processos = min(len(fontes), max_processos or os.cpu_count() or 1)
+
+    if diretorio_rejeitados:
+        os.makedirs(diretorio_rejeitados, exist_ok=True)
+    diretorios = [diretorio_rejeitados] * len(fontes)
+
+    # Um único arquivo (ou processo) não compensa o custo de criar o pool.
+    if processos <= 1:
+        resultados = list(map(_carregar_arquivo_com_relatorio, fontes, diretorios))
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            resultados = list(executor.map(_carregar_arquivo_com_relatorio, fontes, diretorios))
+
+    inicio_consolidacao = time.perf_counter()
+    relatorio = RelatorioCarga(arquivos=[relatorio_arquivo for _, relatorio_arquivo in resultados])
+    partes, prioridades_das_linhas = [], []
+    for caminho, (validos, _) in zip(fontes, resultados):
+        if validos is None or validos.empty:
+            continue
+        partes.append(validos)
+        prioridade = _prioridade_da_fonte(caminho, prioridades) if resolucao == 'prioridade' else 0
+        prioridades_das_linhas.append(np.full(len(validos), prioridade))
+
+    lista_empresas = []
+    if partes:
+        todas = pd.concat(partes, ignore_index=True)
+        # Os códigos do factorize seguem a ordem da primeira aparição de cada nome,
+        # preservando a ordem da carteira consolidada.
+        ordem, nomes_unicos = pd.factorize(todas["nome"])
+        relatorio.duplicados = len(todas) - len(nomes_unicos)
+        # Conflito: uma versão com dados diferentes de todas as já vistas para o mesmo nome.
+        relatorio.conflitos = int((~todas.duplicated()).sum()) - len(nomes_unicos)
+
+        # A ordenação estável mantém a ordem de leitura entre linhas de mesma prioridade,
+        # então a última linha de cada nome é a vencedora nas duas estratégias.
+        todas["_prioridade"] = np.concatenate(prioridades_das_linhas)
+        todas["_ordem"] = ordem
+        vencedoras = (todas.sort_values("_prioridade", kind="stable")
+                      .drop_duplicates("nome", keep="last")
+                      .sort_values("_ordem"))
+        lista_empresas = _empresas_do_bloco(vencedoras)
+
+    relatorio.total_registros = len(lista_empresas)
+    relatorio.tempo_consolidacao_segundos = time.perf_counter() - inicio_consolidacao
+    relatorio.tempo_total_segundos = time.perf_counter() - inicio
+
+    for arq in relatorio.arquivos:
+        if arq.erro:
+            continue
+        logging.info(f"{arq.caminho}: {arq.registros} registros, {arq.rejeitados} rejeitados em {arq.tempo_segundos:.3f}s")
+    logging.info(f"Carga consolidada: {relatorio.total_registros} empresas, {relatorio.duplicados} duplicados "
+                 f"({relatorio.conflitos} conflitos) em {relatorio.tempo_total_segundos:.3f}s, "
+                 f"dos quais {relatorio.tempo_consolidacao_segundos:.3f}s na consolidação")
+    return lista_empresas, relatorio
+
+
+def interpretar_prioridades(texto: str) -> Dict[str, int]:
+    """
+    Converte a configuração de prioridades por fonte em um dicionário.
+
+    Args:
+        texto (str): Pares separados por vírgula, com nome de arquivo ou extensão
+            e a prioridade (ex: "parquet=2,csv=1,legado.json=0").
+
+    Raises:
+        ValueError: Se algum par não estiver no formato '<fonte>=<inteiro>'.
+
+    Returns:
+        Dict[str, int]: A prioridade de cada fonte.
+    """
+    prioridades = {}
+    for par in filter(None, (p.strip() for p in texto.split(','))):
+        fonte, separador, valor = par.partition('=')
+        try:
+            if not separador or not fonte.strip():
+                raise ValueError
+            prioridades[fonte.strip()] = int(valor)
+        except ValueError:
+            raise ValueError(f"Prioridade de fonte inválida: '{par}' (esperado '<fonte>=<inteiro>')") from None
+    return prioridades
+
+
+def carregar_dados_configurados() -> Tuple[List[emp.Empresa], RelatorioCarga]:
+    """
+    Carga usada pela API, configurada pelas variáveis de ambiente:
+    CAMINHO_DADOS (origem), DIRETORIO_REJEITADOS (linhas rejeitadas),
+    RESOLUCAO_DUPLICADOS ('ultima' ou 'prioridade') e PRIORIDADES_FONTES
+    (ex: "parquet=2,csv=1", ver `interpretar_prioridades`).
+
+    Returns:
+        Tuple[List[emp.Empresa], RelatorioCarga]: As empresas consolidadas e o relatório da carga.
+    """
+    return carregar_dados_de_multiplas_fontes(
+        os.getenv("CAMINHO_DADOS", CAMINHO_DADOS_PADRAO),
+        resolucao=os.getenv("RESOLUCAO_DUPLICADOS", RESOLUCAO_PADRAO),
+        prioridades=interpretar_prioridades(os.getenv("PRIORIDADES_FONTES", "")),
+        diretorio_rejeitados=os.getenv("DIRETORIO_REJEITADOS", DIRETORIO_REJEITADOS_PADRAO),
+    )
+
+
+# --- Exportação em Lote ---
+
+# Tipo MIME de cada formato de exportação. O formato 'ndjson' corresponde ao
+# JSON Lines lido por `carregar_dados_json`.
+FORMATOS_EXPORTACAO = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+def _em_lotes(registros: Iterable[Dict[str, Any]], tamanho_lote: int) -> Iterator[List[Dict[str, Any]]]:
+    """Agrupa os registros em listas de no máximo `tamanho_lote` elementos."""
+    lote = []
+    for registro in registros:
+        lote.append(registro)
+        if len(lote) >= tamanho_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def exportar_dados_csv(registros: Iterable[Dict[str, Any]], colunas: List[str],
+                       tamanho_lote: int = 1000) -> Iterator[bytes]:
+    """
+    Serializa os registros em CSV, um lote por vez, com o mesmo cabeçalho lido por `carregar_dados_csv`.
+
+    Args:
+        registros (Iterable[Dict[str, Any]]): Registros indexados pelos nomes de coluna.
+        colunas (List[str]): A ordem das colunas no arquivo.
+        tamanho_lote (int, optional): Quantidade de linhas por bloco emitido. Default é 1000.
+
+    Yields:
+        bytes: Blocos do arquivo CSV codificados em UTF-8.
+    """
+    buffer = io.StringIO()
+    escritor = csv.DictWriter(buffer, fieldnames=colunas, extrasaction='ignore')
+    escritor.writeheader()
+    for lote in _em_lotes(registros, tamanho_lote):
+        escritor.writerows(lote)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def exportar_dados_ndjson(registros: Iterable[Dict[str, Any]], colunas: List[str],
+                          tamanho_lote: int = 1000) -> Iterator[bytes]:
+    """
+    Serializa os registros em JSON Lines, no mesmo formato lido por `carregar_dados_json`.
+
+    Args:
+        registros (Iterable[Dict[str, Any]]): Registros indexados pelos nomes de coluna.
+        colunas (List[str]): As chaves incluídas em cada objeto JSON.
+        tamanho_lote (int, optional): Quantidade de linhas por bloco emitido. Default é 1000.
+
+    Yields:
+        bytes: Blocos de linhas JSON codificados em UTF-8.
+    """
+    for lote in _em_lotes(registros, tamanho_lote):
+        linhas = (json.dumps({c: r.get(c) for c in colunas}, ensure_ascii=False) for r in lote)
+        yield ("\n".join(linhas) + "\n").encode('utf-8')
+
+
+class _SaidaIncremental:
+    """Arquivo somente-escrita em memória que é esvaziado a cada bloco emitido."""
+
+    def __init__(self):
+        self._partes: List[bytes] = []
+        self._posicao = 0
+        self.closed = False
+
+    def write(self, dados) -> int:
+        self._partes.append(bytes(dados))
+        self._posicao += len(dados)
+        return len(dados)
+
+    def tell(self) -> int:
+        return self._posicao
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drenar(self) -> bytes:
+        dados = b"".join(self._partes)
+        self._partes = []
+        return dados
+
+
+def _esquema_parquet(colunas: List[str], amostra: List[Dict[str, Any]]) -> pa.Schema:
+    """
+    Define o tipo de cada coluna do Parquet: os campos inteiros da Empresa são int64;
+    as colunas extras seguem o primeiro valor não nulo da amostra (texto, por padrão).
+    """
+    tipos_inteiros = {COLUNAS_ARQUIVO[campo] for campo in CAMPOS_INTEIROS}
+    tipos = []
+    for coluna in colunas:
+        valor = next((r.get(coluna) for r in amostra if r.get(coluna) is not None), None)
+        if coluna in tipos_inteiros or isinstance(valor, int):
+            tipos.append((coluna, pa.int64()))
+        elif isinstance(valor, float):
+            tipos.append((coluna, pa.float64()))
+        else:
+            tipos.append((coluna, pa.string()))
+    return pa.schema(tipos)
+
+
+def exportar_dados_parquet(registros: Iterable[Dict[str, Any]], colunas: List[str],
+                           tamanho_lote: int = 1000) -> Iterator[bytes]:
+    """
+    Serializa os registros em Parquet, gravando um row group por lote.
+
+    Apenas o lote corrente fica em memória: os bytes de cada row group são
+    emitidos assim que gravados, e o rodapé do arquivo é emitido ao final.
+
+    Args:
+        registros (Iterable[Dict[str, Any]]): Registros indexados pelos nomes de coluna.
+        colunas (List[str]): A ordem das colunas no arquivo.
+        tamanho_lote (int, optional): Quantidade de linhas por row group. Default é 1000.
+
+    Yields:
+        bytes: Blocos do arquivo Parquet.
+    """
+    saida = _SaidaIncremental()
+    escritor = None
+    for lote in _em_lotes(registros, tamanho_lote):
+        if escritor is None:
+            # O esquema é definido pelo primeiro lote e vale para o arquivo inteiro.
+            escritor = pq.ParquetWriter(saida, _esquema_parquet(colunas, lote))
+        escritor.write_table(pa.Table.from_pylist(lote, schema=escritor.schema))
+        yield saida.drenar()
+    if escritor is None:
+        escritor = pq.ParquetWriter(saida, _esquema_parquet(colunas, []))
+    escritor.close()
+    yield saida.drenar()
+
+
+def exportar_dados(registros: Iterable[Dict[str, Any]], formato: str, colunas: Optional[List[str]] = None,
+                   tamanho_lote: int = 1000) -> Iterator[bytes]:
+    """
+    Função despachante da exportação, simétrica a `carregar_dados_de_arquivo`.
+
+    Os arquivos gerados usam os mesmos nomes de coluna da importação e podem
+    ser lidos de volta pelos parsers deste módulo.
+
+    Args:
+        registros (Iterable[Dict[str, Any]]): Registros indexados pelos nomes de coluna
+            (ver `registro_de_empresa`). São consumidos sob demanda.
+        formato (str): 'csv', 'ndjson' ou 'parquet'.
+        colunas (List[str], optional): Colunas exportadas. Default são as colunas de COLUNAS_ARQUIVO.
+        tamanho_lote (int, optional): Quantidade de linhas por bloco emitido. Default é 1000.
+
+    Raises:
+        ValueError: Se o formato não for suportado.
+
+    Returns:
+        Iterator[bytes]: Os blocos do arquivo, prontos para uma resposta em streaming.
+    """
+    colunas = colunas or list(COLUNAS_ARQUIVO.values())
+    if formato == 'csv':
+        return exportar_dados_csv(registros, colunas, tamanho_lote)
+    elif formato == 'ndjson':
+        return exportar_dados_ndjson(registros, colunas, tamanho_lote)
+    elif formato == 'parquet':
+        return exportar_dados_parquet(registros, colunas, tamanho_lote)
+    else:
+        raise ValueError(f"Formato de exportação não suportado: {formato}")
 
 
 # Bloco de execução principal para testes locais
@@ -0,0 +1,181 @@
+# Simulacao.py
+
+"""
+Módulo de apoio às simulações "what-if".
+Calcula um score local (sem IA) para posicionar cada cenário em uma faixa de
+recomendação e mantém, por empresa, as análises já geradas, para que cenários
+próximos e na mesma faixa reaproveitem a análise em vez de chamar a IA de novo.
+"""
+
+import threading
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+from Empresa import Empresa
+
+# --- Score Local ---
+
+PONTOS_RATING = {
+    "A+": 100, "A": 92, "A-": 84,
+    "B+": 75, "B": 66, "B-": 57,
+    "C+": 45, "C": 35, "C-": 25,
+    "D": 0,
+}
+
+# Faixas de recomendação, na mesma redação pedida à IA, com o score mínimo de cada uma.
+FAIXAS_RECOMENDACAO: List[Tuple[float, str]] = [
+    (70.0, "Aprovar Credito"),
+    (45.0, "Aprovar com Cautela"),
+    (0.0, "Recusar Credito"),
+]
+
+# Campos que entram no score local. Uma análise só é reaproveitada entre versões da
+# empresa que diferem apenas nesses campos: qualquer outra mudança (ex: setor ou notícias)
+# altera o contexto da análise sem mover o score.
+CAMPOS_SCORE = frozenset({"rating", "receita_anual", "divida_total", "prazo_pagamento"})
+
+# Distância máxima de score para que um cenário em cache seja considerado "próximo".
+TOLERANCIA_SCORE = 5.0
+# Quantidade máxima de cenários guardados por empresa (os mais antigos saem primeiro).
+MAX_CENARIOS_POR_EMPRESA = 32
+
+ORIGEM_NOVA_CHAMADA = "nova_chamada"
+ORIGEM_REUTILIZADA = "reutilizada"
+
+
+def _interpolar(valor: float, melhor: float, pior: float) -> float:
+    """Converte `valor` em pontos: 100 até `melhor`, 0 a partir de `pior`, linear entre eles."""
+    if valor <= melhor:
+        return 100.0
+    if valor >= pior:
+        return 0.0
+    return 100.0 * (pior - valor) / (pior - melhor)
+
+
+def calcular_score_local(empresa: Empresa) -> float:
+    """
+    Calcula um score de 0 a 100 a partir do rating, do endividamento (dívida/receita)
+    e do prazo médio de pagamento. Não substitui a análise da IA: serve para saber
+    se um cenário mudou de faixa de recomendação.
+
+    Args:
+        empresa (Empresa): A empresa (original ou simulada) a ser pontuada.
+
+    Returns:
+        float: O score local da empresa.
+    """
+    pontos_rating = PONTOS_RATING.get(empresa.rating, 0)
+    endividamento = empresa.divida_total / empresa.receita_anual if empresa.receita_anual > 0 else float("inf")
+    pontos_divida = _interpolar(endividamento, melhor=0.3, pior=1.5)
+    pontos_prazo = _interpolar(empresa.prazo_pagamento, melhor=30, pior=120)
+    return round(0.5 * pontos_rating + 0.35 * pontos_divida + 0.15 * pontos_prazo, 1)
+
+
+def faixa_de_recomendacao(score: float) -> str:
+    """Retorna a faixa de recomendação correspondente ao score local."""
+    for minimo, faixa in FAIXAS_RECOMENDACAO:
+        if score >= minimo:
+            return faixa
+    return FAIXAS_RECOMENDACAO[-1][1]
+
+
+def diferencas_entre(referencia: Empresa, cenario: Empresa) -> Dict[str, Tuple[Any, Any]]:
+    """Lista os campos que mudaram entre duas versões da empresa, como (antes, depois)."""
+    return {
+        f.name: (getattr(referencia, f.name), getattr(cenario, f.name))
+        for f in fields(Empresa)
+        if getattr(referencia, f.name) != getattr(cenario, f.name)
+    }
+
+
+# --- Cache de Análises por Empresa ---
+
+@dataclass
+class AnaliseEmCache:
+    """Uma análise já gerada para um cenário (ou para os dados originais, se sem alterações)."""
+    empresa: Empresa
+    alteracoes: Dict[str, Any]
+    score: float
+    faixa: str
+    analise: str
+
+
+@dataclass
+class _EntradaEmpresa:
+    original: Empresa
+    base: Optional[AnaliseEmCache] = None
+    cenarios: List[AnaliseEmCache] = field(default_factory=list)
+
+
+class CacheSimulacoes:
+    """
+    Guarda, por empresa, a análise base e as análises dos cenários já simulados.
+
+    As entradas são descartadas quando os dados originais da empresa mudam
+    (ex: após uma recarga da carteira), pois deixam de descrever o mesmo ponto de partida.
+    """
+
+    def __init__(self, max_cenarios: int = MAX_CENARIOS_POR_EMPRESA):
+        self.max_cenarios = max_cenarios
+        self._entradas: Dict[str, _EntradaEmpresa] = {}
+        self._trava = threading.Lock()
+
+    def _entrada(self, original: Empresa) -> _EntradaEmpresa:
+        entrada = self._entradas.get(original.nome)
+        if entrada is None or entrada.original != original:
+            entrada = self._entradas[original.nome] = _EntradaEmpresa(original=original)
+        return entrada
+
+    def registrar_base(self, original: Empresa, analise: str):
+        """Guarda a análise dos dados originais, gerada pelo endpoint de análise padrão."""
+        score = calcular_score_local(original)
+        with self._trava:
+            self._entrada(original).base = AnaliseEmCache(original, {}, score, faixa_de_recomendacao(score), analise)
+
+    def registrar_cenario(self, original: Empresa, cenario: AnaliseEmCache):
+        """Guarda a análise de um cenário simulado."""
+        with self._trava:
+            cenarios = self._entrada(original).cenarios
+            cenarios.append(cenario)
+            del cenarios[:-self.max_cenarios]
+
+    def _candidatos(self, original: Empresa) -> List[AnaliseEmCache]:
+        entrada = self._entrada(original)
+        return ([entrada.base] if entrada.base else []) + entrada.cenarios
+
+    def buscar_reutilizavel(self, original: Empresa, cenario: Empresa) -> Optional[AnaliseEmCache]:
+        """
+        Busca a análise em cache mais próxima que esteja na mesma faixa de recomendação,
+        a no máximo TOLERANCIA_SCORE pontos de distância e que difira do cenário apenas
+        em campos do score (CAMPOS_SCORE).
+
+        Args:
+            original (Empresa): Os dados originais da empresa, que identificam a entrada do cache.
+            cenario (Empresa): A versão simulada da empresa.
+
+        Returns:
+            Optional[AnaliseEmCache]: A análise reaproveitável, ou None se o cenário exigir uma nova chamada.
+        """
+        score = calcular_score_local(cenario)
+        faixa = faixa_de_recomendacao(score)
+        with self._trava:
+            candidatos = [c for c in self._candidatos(original)
+                          if c.faixa == faixa and abs(c.score - score) <= TOLERANCIA_SCORE
+                          and diferencas_entre(c.empresa, cenario).keys() <= CAMPOS_SCORE]
+        return min(candidatos, key=lambda c: abs(c.score - score), default=None)
+
+    def buscar_referencia(self, original: Empresa, score: float) -> Optional[AnaliseEmCache]:
+        """Busca a análise em cache de score mais próximo, em qualquer faixa, para servir de ponto de partida."""
+        with self._trava:
+            candidatos = self._candidatos(original)
+        return min(candidatos, key=lambda c: abs(c.score - score), default=None)
+
+
+def anotar_reutilizacao(reutilizada: AnaliseEmCache, score: float) -> str:
+    """Acrescenta à análise reaproveitada um aviso de que ela veio de um cenário próximo."""
+    cenario = reutilizada.alteracoes or "dados originais"
+    return (
+        f"[Analise reutilizada] O cenario simulado (score local {score}) permanece na faixa "
+        f"'{reutilizada.faixa}', a mesma do cenario {cenario} (score local {reutilizada.score}). "
+        f"A analise abaixo foi gerada para aquele cenario.\n\n{reutilizada.analise}"
+    )
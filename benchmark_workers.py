@@ -0,0 +1,131 @@
+# benchmark_workers.py
+
+"""
+Mede memória por worker e tempo de inicialização da API com 1 a 16 workers,
+comparando o `uvicorn main:app --workers N` tradicional (cada worker faz o parsing
+e guarda a sua própria cópia da carteira) com o `servidor.py`, listado como modo
+"compartilhado" (carteira carregada uma vez pelo processo pai e compartilhada entre os workers).
+
+As medidas de memória leem /proc e, portanto, só funcionam no Linux:
+- RSS: memória residente do worker, incluindo as páginas compartilhadas.
+- PSS: páginas compartilhadas divididas entre os processos que as usam; a soma
+  dos PSS é a memória efetivamente ocupada pelo conjunto.
+
+Uso:
+    python benchmark_workers.py --linhas 100000 --workers 1,2,4,8,16
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+MARCA_INICIALIZACAO = "Application startup complete."
+
+
+def gerar_carteira(linhas: int, diretorio: str) -> str:
+    """Replica a base fictícia até `linhas` registros, com nomes únicos, em Parquet."""
+    base = pd.read_csv("dados/dadoscreditoficticios.csv")
+    repeticoes = -(-linhas // len(base))
+    carteira = pd.concat([base] * repeticoes, ignore_index=True).head(linhas)
+    carteira["Empresa"] = [f"Empresa {i + 1}" for i in range(len(carteira))]
+    caminho = os.path.join(diretorio, "carteira.parquet")
+    carteira.to_parquet(caminho, index=False)
+    return caminho
+
+
+def _ler_proc(pid: int, arquivo: str, chave: str) -> int:
+    """Lê um campo em kB de /proc/<pid>/<arquivo>."""
+    with open(f"/proc/{pid}/{arquivo}") as f:
+        for linha in f:
+            if linha.startswith(chave + ":"):
+                return int(linha.split()[1])
+    return 0
+
+
+def _workers_de(pid_pai: int):
+    """Filhos do processo pai que são workers do Uvicorn (ignora o resource_tracker)."""
+    with open(f"/proc/{pid_pai}/task/{pid_pai}/children") as f:
+        filhos = [int(p) for p in f.read().split()]
+    workers = []
+    for pid in filhos:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            if b"resource_tracker" not in f.read():
+                workers.append(pid)
+    return workers
+
+
+def medir(modo: str, workers: int, porta: int, caminho_dados: str, diretorio: str) -> dict:
+    if modo == "uvicorn":
+        comando = [sys.executable, "-m", "uvicorn", "main:app", "--workers", str(workers), "--port", str(porta)]
+    else:
+        comando = [sys.executable, "servidor.py", "--workers", str(workers), "--port", str(porta)]
+    ambiente = dict(os.environ, CAMINHO_DADOS=caminho_dados, DIRETORIO_REJEITADOS=os.path.join(diretorio, "rejeitados"))
+    caminho_log = os.path.join(diretorio, f"{modo}-{workers}.log")
+
+    with open(caminho_log, "w") as log:
+        inicio = time.perf_counter()
+        processo = subprocess.Popen(comando, stdout=log, stderr=subprocess.STDOUT, env=ambiente)
+        try:
+            while True:
+                with open(caminho_log) as f:
+                    if f.read().count(MARCA_INICIALIZACAO) >= workers:
+                        break
+                if processo.poll() is not None:
+                    raise RuntimeError(f"Servidor encerrou antes de iniciar; veja {caminho_log}")
+                time.sleep(0.05)
+            tempo_inicializacao = time.perf_counter() - inicio
+
+            # Aquecimento: requisições concorrentes que percorrem a carteira inteira,
+            # para que cada worker de fato toque nas páginas dos dados.
+            url = f"http://127.0.0.1:{porta}/empresas"
+            with ThreadPoolExecutor(max_workers=4 * workers) as executor:
+                list(executor.map(lambda _: urllib.request.urlopen(url).read(), range(4 * workers)))
+
+            # Com um único worker, o `uvicorn` atende no próprio processo, sem supervisor.
+            pids = _workers_de(processo.pid) or [processo.pid]
+            rss = [_ler_proc(pid, "status", "VmRSS") for pid in pids]
+            pss = [_ler_proc(pid, "smaps_rollup", "Pss") for pid in pids]
+            pss_pai = _ler_proc(processo.pid, "smaps_rollup", "Pss") if processo.pid not in pids else 0
+        finally:
+            processo.send_signal(signal.SIGINT)
+            processo.wait(timeout=60)
+
+    return {
+        "modo": modo,
+        "workers": workers,
+        "inicializacao_s": tempo_inicializacao,
+        "rss_medio_mb": sum(rss) / len(rss) / 1024,
+        "pss_medio_mb": sum(pss) / len(pss) / 1024,
+        "pss_total_mb": (sum(pss) + pss_pai) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=100000)
+    parser.add_argument("--workers", default="1,2,4,8,16")
+    parser.add_argument("--porta", type=int, default=8100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_dados = gerar_carteira(args.linhas, diretorio)
+        print(f"Carteira de {args.linhas} empresas | CPUs: {os.cpu_count()}\n")
+        print("| Modo | Workers | Inicialização (s) | RSS médio/worker (MB) | PSS médio/worker (MB) | PSS total (MB) |")
+        print("|---|---|---|---|---|---|")
+        for modo in ("uvicorn", "compartilhado"):
+            for n in (int(w) for w in args.workers.split(",")):
+                r = medir(modo, n, args.porta, caminho_dados, diretorio)
+                print(f"| {r['modo']} | {r['workers']} | {r['inicializacao_s']:.1f} | {r['rss_medio_mb']:.0f} "
+                      f"| {r['pss_medio_mb']:.0f} | {r['pss_total_mb']:.0f} |", flush=True)
+
+
+if __name__ == "__main__":
+    main()
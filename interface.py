@@ -132,7 +132,11 @@ if empresa_selecionada:
                         res = requests.post(f"{API_URL}/simular", json=payload)
                         if res.status_code == 200:
                             resultado = res.json()
-                            st.session_state.titulo_resultado = f"Resultado da Simulação para **{empresa_selecionada}** (Cenário: {resultado.get('cenario_simulado')})"
+                            origem = "análise reutilizada de cenário próximo" if resultado.get("origem_analise") == "reutilizada" else "nova análise da IA"
+                            st.session_state.titulo_resultado = (
+                                f"Resultado da Simulação para **{empresa_selecionada}** (Cenário: {resultado.get('cenario_simulado')})"
+                                f" — Score local: {resultado.get('score_local')} | {origem}"
+                            )
                             st.session_state.resultado_texto = resultado.get("analise_simulada", "Erro ao obter analise simulada.")
                         else:
                             st.error(f"Erro na simulacao: {res.json().get('detail', 'Erro desconhecido')}")
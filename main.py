@@ -3,19 +3,27 @@
 """
 Serviço de API para o Assistente de Análise de Crédito.
 Fornece endpoints para listar empresas, obter detalhes de uma empresa,
-executar análises de crédito padrão e simular cenários.
+executar análises de crédito padrão, simular cenários e exportar a carteira.
 """
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import copy
-from typing import List, Dict, Any
+import logging
+import os
+import time
+from typing import List, Dict, Any, Optional
 
 # Importações dos módulos locais
-from Parses import carregar_dados_de_arquivo
-from GeminiAPI import gerar_analise_de_credito
+from Parses import (carregar_dados_configurados, exportar_dados, registro_de_empresa,
+                    COLUNAS_ARQUIVO, FORMATOS_EXPORTACAO)
+from GeminiAPI import gerar_analise_de_credito, gerar_analise_incremental
 from Empresa import Empresa
+from CarteiraCompartilhada import CarteiraColunar, LeitorCarteira, VARIAVEL_AMBIENTE
+from Simulacao import (CacheSimulacoes, AnaliseEmCache, calcular_score_local, faixa_de_recomendacao,
+                       diferencas_entre, anotar_reutilizacao, ORIGEM_NOVA_CHAMADA, ORIGEM_REUTILIZADA)
 
 # --- Modelos de Dados Pydantic ---
 
@@ -42,19 +50,56 @@ app.add_middleware(
 
 # --- Carregamento de Dados e Estado da Aplicação ---
 
+COLUNA_ANALISE = "Análise de Crédito"
+COLUNA_SCORE = "Score Local"
+
 @app.on_event("startup")
 def carregar_modelo_e_dados():
     """
     Função executada na inicialização do servidor. Carrega os dados das empresas
     para a memória da aplicação, evitando recargas a cada requisição.
+
+    A origem pode ser um arquivo, um diretório ou um padrão glob, definida pela
+    variável de ambiente CAMINHO_DADOS. Várias fontes são lidas em paralelo e
+    consolidadas por nome, conforme RESOLUCAO_DUPLICADOS e PRIORIDADES_FONTES
+    (ver `carregar_dados_configurados`). As linhas reprovadas na validação são
+    gravadas em DIRETORIO_REJEITADOS.
     """
+    # Estado mantido na memória deste processo: no modo multi-worker, cada worker tem o seu.
+    app.state.ultimas_analises = {}
+    app.state.cache_simulacoes = CacheSimulacoes()
+    app.state.leitor_carteira = None
+
+    # Modo multi-worker (servidor.py): a carteira já foi carregada pelo processo pai
+    # e é apenas mapeada da memória compartilhada, sem novo parsing.
+    diretorio_compartilhado = os.getenv(VARIAVEL_AMBIENTE)
+    if diretorio_compartilhado:
+        app.state.leitor_carteira = LeitorCarteira(diretorio_compartilhado)
+        app.state.leitor_carteira.sincronizar()
+        app.state.lista_empresas = app.state.leitor_carteira.carteira or []
+        app.state.relatorio_carga = app.state.leitor_carteira.relatorio
+        print(f"INFO: Carteira compartilhada mapeada com {len(app.state.lista_empresas)} registros de empresas.")
+        return
+
     try:
-        caminho_dados = 'dados/dadoscreditoficticios.csv'
-        app.state.lista_empresas = carregar_dados_de_arquivo(caminho_dados)
+        app.state.lista_empresas, app.state.relatorio_carga = carregar_dados_configurados()
         print(f"INFO: Carregados {len(app.state.lista_empresas)} registros de empresas na inicialização.")
     except Exception as e:
         print(f"ERRO CRÍTICO na inicialização: Não foi possível carregar os dados. {e}")
         app.state.lista_empresas = []
+        app.state.relatorio_carga = None
+
+@app.middleware("http")
+async def sincronizar_carteira_compartilhada(request: Request, call_next):
+    """
+    No modo multi-worker, troca a carteira deste worker assim que o processo pai
+    publica uma nova geração. Fora desse modo, não faz nada.
+    """
+    leitor = getattr(request.app.state, "leitor_carteira", None)
+    if leitor is not None and leitor.sincronizar():
+        request.app.state.lista_empresas = leitor.carteira
+        request.app.state.relatorio_carga = leitor.relatorio
+    return await call_next(request)
 
 # --- Endpoints da API ---
 
@@ -62,14 +107,36 @@ def get_lista_empresas(request: Request) -> List[Empresa]:
     """Função utilitária para acessar a lista de empresas do estado da aplicação."""
     return request.app.state.lista_empresas
 
+def buscar_empresa(request: Request, nome_empresa: str) -> Optional[Empresa]:
+    """Busca uma empresa pelo nome exato na carteira carregada."""
+    empresas = get_lista_empresas(request)
+    if isinstance(empresas, CarteiraColunar):
+        return empresas.buscar(nome_empresa)
+    return next((emp for emp in empresas if emp.nome == nome_empresa), None)
+
 @app.get("/empresas", summary="Lista todas as empresas disponíveis")
 def listar_empresas_endpoint(request: Request):
     """
     Retorna uma lista contendo os nomes de todas as empresas carregadas na base de dados.
     """
-    lista_nomes = [emp.nome for emp in get_lista_empresas(request)]
+    empresas = get_lista_empresas(request)
+    # Na carteira compartilhada, lê só a coluna de nomes, sem montar um objeto por empresa.
+    if isinstance(empresas, CarteiraColunar):
+        return {"nomes": empresas.tabela["nome"].to_pylist()}
+    lista_nomes = [emp.nome for emp in empresas]
     return {"nomes": lista_nomes}
 
+@app.get("/carga/resumo", summary="Resumo da última carga de dados")
+def resumo_carga_endpoint(request: Request):
+    """
+    Retorna o relatório da carga feita na inicialização: registros aceitos e
+    rejeitados por arquivo, contagem por motivo de rejeição, duplicados e tempos.
+    """
+    relatorio = request.app.state.relatorio_carga
+    if relatorio is None:
+        raise HTTPException(status_code=503, detail="Nenhuma carga de dados concluída com sucesso")
+    return relatorio
+
 @app.get("/empresa/{nome_empresa}", summary="Obtém detalhes de uma empresa específica")
 def get_empresa_details_endpoint(nome_empresa: str, request: Request):
     """
@@ -78,7 +145,7 @@ def get_empresa_details_endpoint(nome_empresa: str, request: Request):
     Args:
         nome_empresa (str): O nome exato da empresa a ser buscada.
     """
-    empresa_encontrada = next((emp for emp in get_lista_empresas(request) if emp.nome == nome_empresa), None)
+    empresa_encontrada = buscar_empresa(request, nome_empresa)
     if not empresa_encontrada:
         raise HTTPException(status_code=404, detail="Empresa não encontrada")
     return empresa_encontrada # Pydantic/FastAPI converte automaticamente para JSON
@@ -93,17 +160,77 @@ def analisar_empresa_endpoint(nome_empresa: str, request: Request):
         nome_empresa (str): O nome exato da empresa a ser analisada.
     """
     print(f"INFO: Recebida requisição de análise para: {nome_empresa}")
-    empresa_encontrada = next((emp for emp in get_lista_empresas(request) if emp.nome == nome_empresa), None)
+    empresa_encontrada = buscar_empresa(request, nome_empresa)
     if not empresa_encontrada:
         raise HTTPException(status_code=404, detail="Empresa não encontrada")
     
     try:
         analise = gerar_analise_de_credito(empresa_encontrada)
+        # Guarda a análise mais recente de cada empresa para a exportação em lote
+        # e como ponto de partida das simulações.
+        if not analise.startswith("ERRO"):
+            request.app.state.ultimas_analises[nome_empresa] = analise
+            request.app.state.cache_simulacoes.registrar_base(empresa_encontrada, analise)
         return {"empresa": nome_empresa, "analise_de_credito": analise}
     except Exception as e:
         print(f"ERRO: Falha ao gerar análise para {nome_empresa}: {e}")
         raise HTTPException(status_code=500, detail=f"Erro interno ao processar análise de IA: {e}")
 
+@app.get("/exportar", summary="Exporta a carteira em lote (CSV, NDJSON ou Parquet)")
+def exportar_carteira_endpoint(
+    request: Request,
+    formato: str = "csv",
+    setor: Optional[str] = None,
+    rating: Optional[str] = None,
+    incluir_analises: bool = False,
+    incluir_scores: bool = False,
+    tamanho_lote: int = Query(1000, ge=1, le=100000),
+):
+    """
+    Exporta a carteira filtrada em streaming (chunked), sem materializar o arquivo
+    completo em memória. O arquivo usa as mesmas colunas da importação (ver `Parses.py`).
+
+    Args:
+        formato (str): 'csv', 'ndjson' ou 'parquet'. Default é 'csv'.
+        setor (str, optional): Exporta apenas as empresas deste setor.
+        rating (str, optional): Exporta apenas as empresas com este rating.
+        incluir_analises (bool): Se True, acrescenta a última análise gerada para cada empresa.
+            Indisponível no modo multi-worker (servidor.py).
+        incluir_scores (bool): Se True, acrescenta o score local de cada empresa (ver `Simulacao.py`).
+        tamanho_lote (int): Linhas por bloco emitido (ou por row group, no Parquet).
+    """
+    if formato not in FORMATOS_EXPORTACAO:
+        raise HTTPException(status_code=400, detail=f"Formato de exportação não suportado: {formato}")
+    # No modo multi-worker, as análises ficam na memória do worker que as gerou, e a
+    # exportação sairia incompleta conforme o worker que atendesse a requisição.
+    if incluir_analises and request.app.state.leitor_carteira is not None:
+        raise HTTPException(status_code=400,
+                            detail="incluir_analises não é suportado no modo multi-worker (servidor.py)")
+
+    empresas = get_lista_empresas(request)
+    analises = request.app.state.ultimas_analises
+
+    def registros_filtrados():
+        for empresa in empresas:
+            if setor is not None and empresa.setor != setor:
+                continue
+            if rating is not None and empresa.rating != rating:
+                continue
+            registro = registro_de_empresa(empresa)
+            if incluir_scores:
+                registro[COLUNA_SCORE] = calcular_score_local(empresa)
+            if incluir_analises:
+                registro[COLUNA_ANALISE] = analises.get(empresa.nome)
+            yield registro
+
+    colunas = (list(COLUNAS_ARQUIVO.values()) + ([COLUNA_SCORE] if incluir_scores else [])
+               + ([COLUNA_ANALISE] if incluir_analises else []))
+    return StreamingResponse(
+        exportar_dados(registros_filtrados(), formato, colunas, tamanho_lote),
+        media_type=FORMATOS_EXPORTACAO[formato],
+        headers={"Content-Disposition": f'attachment; filename="carteira.{formato}"'},
+    )
+
 @app.post("/simular", summary="Executa simulação de cenário de crédito")
 def simular_cenario_endpoint(payload: SimulacaoPayload, request: Request):
     """
@@ -115,7 +242,7 @@ def simular_cenario_endpoint(payload: SimulacaoPayload, request: Request):
                                     dicionário de alterações (ex: {"receita_anual": 500000}).
     """
     print(f"INFO: Recebida requisição de simulação para: {payload.nome_empresa}")
-    empresa_original = next((emp for emp in get_lista_empresas(request) if emp.nome == payload.nome_empresa), None)
+    empresa_original = buscar_empresa(request, payload.nome_empresa)
     if not empresa_original:
         raise HTTPException(status_code=404, detail="Empresa não encontrada para simulação")
 
@@ -137,10 +264,45 @@ def simular_cenario_endpoint(payload: SimulacaoPayload, request: Request):
         else:
             logging.warning(f"Tentativa de simular campo inexistente: '{campo}'")
     
-    # 3. Gera a nova análise com base nos dados simulados.
-    try:
-        analise_simulada = gerar_analise_de_credito(empresa_simulada)
-        return {"empresa": payload.nome_empresa, "cenario_simulado": payload.alteracoes, "analise_simulada": analise_simulada}
-    except Exception as e:
-        print(f"ERRO: Falha ao gerar análise simulada para {payload.nome_empresa}: {e}")
-        raise HTTPException(status_code=500, detail=f"Erro interno ao processar simulação de IA: {e}")
\ No newline at end of file
+    # 3. Posiciona o cenário pelo score local e tenta reaproveitar uma análise em cache.
+    # Se um cenário próximo já analisado está na mesma faixa de recomendação e difere
+    # dele só em campos do score, a IA não é chamada; cenários que cruzam uma fronteira
+    # de decisão ou mudam outros campos (ex: setor, notícias) geram nova análise.
+    inicio = time.perf_counter()
+    cache = request.app.state.cache_simulacoes
+    score = calcular_score_local(empresa_simulada)
+    faixa = faixa_de_recomendacao(score)
+    referencia = cache.buscar_reutilizavel(empresa_original, empresa_simulada)
+
+    if referencia is not None:
+        origem = ORIGEM_REUTILIZADA
+        analise_simulada = anotar_reutilizacao(referencia, score)
+    else:
+        # 4. Gera a nova análise, focada no que mudou em relação à análise mais próxima, se houver.
+        origem = ORIGEM_NOVA_CHAMADA
+        referencia = cache.buscar_referencia(empresa_original, score)
+        try:
+            if referencia is not None:
+                analise_simulada = gerar_analise_incremental(
+                    empresa_simulada, referencia.analise, diferencas_entre(referencia.empresa, empresa_simulada)
+                )
+            else:
+                analise_simulada = gerar_analise_de_credito(empresa_simulada)
+        except Exception as e:
+            print(f"ERRO: Falha ao gerar análise simulada para {payload.nome_empresa}: {e}")
+            raise HTTPException(status_code=500, detail=f"Erro interno ao processar simulação de IA: {e}")
+        if not analise_simulada.startswith("ERRO"):
+            cache.registrar_cenario(empresa_original, AnaliseEmCache(
+                empresa_simulada, dict(payload.alteracoes), score, faixa, analise_simulada
+            ))
+
+    return {
+        "empresa": payload.nome_empresa,
+        "cenario_simulado": payload.alteracoes,
+        "analise_simulada": analise_simulada,
+        "origem_analise": origem,
+        "score_local": score,
+        "faixa_recomendacao": faixa,
+        "cenario_referencia": referencia.alteracoes if referencia is not None else None,
+        "tempo_ms": round((time.perf_counter() - inicio) * 1000, 1),
+    }
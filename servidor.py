@@ -0,0 +1,77 @@
+# servidor.py
+
+"""
+Modo de produção com vários workers do Uvicorn compartilhando uma única carteira.
+
+O processo pai carrega e valida os dados uma vez, publica a carteira em memória
+compartilhada (ver CarteiraCompartilhada.py) e só então inicia os workers, que
+apenas mapeiam os dados já prontos. Ao receber SIGUSR1, o pai recarrega as fontes
+e publica uma nova geração, que passa a valer para todos os workers ao mesmo tempo.
+
+Só a carteira é compartilhada. As últimas análises e o cache de simulações continuam
+na memória de cada worker: uma simulação pode não reaproveitar a análise gerada por
+outro worker, e a exportação com `incluir_analises` é recusada neste modo.
+
+Uso:
+    python servidor.py --workers 4 --port 8000
+    kill -USR1 <pid do processo pai>   # recarrega a carteira
+"""
+
+import argparse
+import logging
+import os
+
+import uvicorn
+from dotenv import load_dotenv
+from uvicorn.supervisors import Multiprocess
+
+from CarteiraCompartilhada import PublicadorCarteira, VARIAVEL_AMBIENTE
+from Parses import carregar_dados_configurados
+
+
+def publicar_carteira(publicador: PublicadorCarteira) -> int:
+    """Carrega as fontes configuradas no ambiente (ver `carregar_dados_configurados`) e publica uma nova geração."""
+    empresas, relatorio = carregar_dados_configurados()
+    return publicador.publicar(empresas, relatorio)
+
+
+class SupervisorCarteira(Multiprocess):
+    """Supervisor de workers do Uvicorn que também trata a recarga da carteira (SIGUSR1)."""
+
+    def __init__(self, config: uvicorn.Config, target, sockets, publicador: PublicadorCarteira):
+        super().__init__(config, target, sockets)
+        self.publicador = publicador
+
+    def handle_usr1(self) -> None:
+        logging.info("Recebido SIGUSR1, recarregando a carteira compartilhada.")
+        try:
+            publicar_carteira(self.publicador)
+        except Exception as e:
+            # Uma recarga com falha mantém a geração atual em uso pelos workers.
+            logging.error(f"Falha ao recarregar a carteira; a geração atual foi mantida. {e}")
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="API de análise de crédito com carteira compartilhada entre workers.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    publicador = PublicadorCarteira()
+    try:
+        publicar_carteira(publicador)
+        # Os workers são processos novos (spawn) e herdam esta variável de ambiente.
+        os.environ[VARIAVEL_AMBIENTE] = publicador.diretorio
+
+        config = uvicorn.Config("main:app", host=args.host, port=args.port, workers=args.workers)
+        server = uvicorn.Server(config=config)
+        sock = config.bind_socket()
+        SupervisorCarteira(config, target=server.run, sockets=[sock], publicador=publicador).run()
+    finally:
+        publicador.encerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -128,4 +128,307 @@ def test_endpoint_get_empresa_details_nao_encontrado(client: TestClient):
     response = client.get(f"/empresa/{nome_empresa_inexistente}")
     
     # Assert: Verifica o status code
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+# --- Bloco 3: Ingestão de Múltiplas Fontes ---
+
+def test_carregar_dados_de_multiplas_fontes_deduplica_por_nome(tmp_path):
+    """
+    Testa se a carga de um diretório consolida as empresas repetidas pelo nome,
+    prevalecendo o último arquivo em ordem alfabética, e se o relatório
+    contabiliza duplicados, conflitos e linhas rejeitadas por arquivo.
+    """
+    cabecalho = "Empresa,Receita Anual,Dívida Total,Prazo de Pagamento (dias),Setor,Rating,Notícias Recentes\n"
+    (tmp_path / "a.csv").write_text(
+        cabecalho +
+        "Empresa X,100000,50000,30,Tecnologia,A,Antiga\n"
+        "Empresa Y,200000,150000,60,Saude,B,Noticia\n"
+        "Empresa Z,invalido,150000,60,Saude,B,Noticia\n",
+        encoding="utf-8"
+    )
+    (tmp_path / "b.json").write_text(
+        '{"Empresa":"Empresa X","Receita Anual":300000,"Dívida Total":50000,"Prazo de Pagamento (dias)":30,'
+        '"Setor":"Tecnologia","Rating":"A+","Notícias Recentes":"Nova"}\n',
+        encoding="utf-8"
+    )
+
+    empresas, relatorio = Parses.carregar_dados_de_multiplas_fontes(str(tmp_path), max_processos=2)
+
+    por_nome = {e.nome: e for e in empresas}
+    assert sorted(por_nome) == ["Empresa X", "Empresa Y"]
+    assert por_nome["Empresa X"].receita_anual == 300000
+    assert relatorio.duplicados == 1 and relatorio.conflitos == 1
+    assert [a.rejeitados for a in relatorio.arquivos] == [1, 0]
+
+    # Com prioridade por extensão, o CSV passa a prevalecer sobre o JSON.
+    empresas, _ = Parses.carregar_dados_de_multiplas_fontes(
+        str(tmp_path), resolucao="prioridade", prioridades={"csv": 2, "json": 1}
+    )
+    assert {e.nome: e for e in empresas}["Empresa X"].receita_anual == 100000
+
+
+def test_carregar_dados_configurados_le_prioridades_do_ambiente(tmp_path, monkeypatch):
+    """
+    Testa se a carga da API aplica a resolução por prioridade definida nas variáveis
+    de ambiente e se uma prioridade mal formatada é recusada.
+    """
+    cabecalho = "Empresa,Receita Anual,Dívida Total,Prazo de Pagamento (dias),Setor,Rating,Notícias Recentes\n"
+    (tmp_path / "a.csv").write_text(cabecalho + "Empresa X,100000,50000,30,Tecnologia,A,Antiga\n", encoding="utf-8")
+    (tmp_path / "b.csv").write_text(cabecalho + "Empresa X,300000,50000,30,Tecnologia,A,Nova\n", encoding="utf-8")
+    monkeypatch.setenv("CAMINHO_DADOS", str(tmp_path))
+    monkeypatch.setenv("DIRETORIO_REJEITADOS", str(tmp_path / "rejeitados"))
+    monkeypatch.setenv("RESOLUCAO_DUPLICADOS", "prioridade")
+    monkeypatch.setenv("PRIORIDADES_FONTES", "a.csv=2, csv=1")
+
+    empresas, _ = Parses.carregar_dados_configurados()
+    assert [e.receita_anual for e in empresas] == [100000]
+
+    with pytest.raises(ValueError):
+        Parses.interpretar_prioridades("parquet:2")
+
+
+def test_carregar_dados_de_multiplas_fontes_ignora_arquivo_com_falha(tmp_path):
+    """
+    Testa se um arquivo que não pode ser lido (XML malformado) é registrado com o
+    erro no relatório, sem impedir a carga dos demais arquivos.
+    """
+    (tmp_path / "a.csv").write_text(
+        "Empresa,Receita Anual,Dívida Total,Prazo de Pagamento (dias),Setor,Rating,Notícias Recentes\n"
+        "Empresa X,100000,50000,30,Tecnologia,A,Noticia\n",
+        encoding="utf-8"
+    )
+    (tmp_path / "b.xml").write_text("<data><row><Empresa>Empresa Y</Empresa>", encoding="utf-8")
+
+    empresas, relatorio = Parses.carregar_dados_de_multiplas_fontes(str(tmp_path))
+
+    assert [e.nome for e in empresas] == ["Empresa X"]
+    assert relatorio.arquivos[0].erro is None
+    assert relatorio.arquivos[1].erro.startswith("ParseError")
+
+
+# --- Bloco 4: Exportação em Lote ---
+
+@pytest.mark.parametrize("formato", ["csv", "ndjson", "parquet"])
+def test_endpoint_exportar_reimportavel(client: TestClient, tmp_path, formato):
+    """
+    Testa se o endpoint GET /exportar aplica os filtros e gera um arquivo que
+    os próprios parsers conseguem ler de volta (importação e exportação simétricas).
+    """
+    client.app.state.lista_empresas = [
+        Empresa(nome=f"Empresa {i}", receita_anual=100000 + i, divida_total=5000, prazo_pagamento=30,
+                setor="Tecnologia" if i % 2 else "Varejo", rating="A", noticias_recentes="Tudo certo.")
+        for i in range(25)
+    ]
+
+    response = client.get("/exportar", params={"formato": formato, "setor": "Tecnologia", "tamanho_lote": 5})
+
+    assert response.status_code == 200
+    nome_arquivo = response.headers["content-disposition"].split("filename=")[1].strip('"')
+    caminho = tmp_path / nome_arquivo
+    caminho.write_bytes(response.content)
+    empresas = Parses.carregar_dados_de_arquivo(str(caminho))
+    assert len(empresas) == 12
+    assert empresas[0] == client.app.state.lista_empresas[1]
+
+
+def test_endpoint_exportar_formato_invalido(client: TestClient):
+    """Testa se um formato de exportação desconhecido retorna 400 (Bad Request)."""
+    response = client.get("/exportar", params={"formato": "xlsx"})
+    assert response.status_code == 400
+
+
+# --- Bloco 5: Validação na Ingestão ---
+
+def test_validacao_gera_arquivo_de_rejeitados(tmp_path):
+    """
+    Testa se as regras declarativas rejeitam valores negativos, ratings desconhecidos,
+    prazos fora dos limites e tipos inválidos (incluindo inteiros que não cabem em int64
+    e números escritos com casas decimais), gravando cada linha com o código do motivo.
+    """
+    caminho = tmp_path / "sujo.csv"
+    caminho.write_text(
+        "Empresa,Receita Anual,Dívida Total,Prazo de Pagamento (dias),Setor,Rating,Notícias Recentes\n"
+        "Empresa Ok,100000,50000,30,Tecnologia,A,Noticia\n"
+        "Empresa Negativa,100000,-1,30,Tecnologia,A,Noticia\n"
+        "Empresa Rating,100000,50000,30,Tecnologia,Z,Noticia\n"
+        "Empresa Prazo,100000,50000,900,Tecnologia,B,Noticia\n"
+        "Empresa Tipo,cem mil,50000,30,Tecnologia,B,\n"
+        "Empresa Gigante,99999999999999999999,50000,30,Tecnologia,A,Noticia\n"
+        "Empresa Decimal,100000,50000,30.0,Tecnologia,A,Noticia\n",
+        encoding="utf-8"
+    )
+    caminho_rejeitados = tmp_path / "sujo.rejeitados.csv"
+    relatorio = Parses.RelatorioArquivo(caminho=str(caminho))
+
+    empresas = Parses.carregar_dados_csv(str(caminho), relatorio, str(caminho_rejeitados))
+
+    assert [e.nome for e in empresas] == ["Empresa Ok"]
+    assert relatorio.registros == 1 and relatorio.rejeitados == 6
+    assert relatorio.motivos == {"minimo:divida_total": 1, "dominio:rating": 1, "maximo:prazo_pagamento": 1,
+                                 "tipo:receita_anual": 2, "tipo:prazo_pagamento": 1}
+    linhas = caminho_rejeitados.read_text(encoding="utf-8").splitlines()
+    assert linhas[0].startswith("linha,motivo,Empresa")
+    assert linhas[1].startswith("2,minimo:divida_total,Empresa Negativa")
+    assert len(linhas) == 7
+
+
+def test_validacao_csv_com_campos_a_mais_ou_vazio(tmp_path):
+    """
+    Testa se um registro CSV com quantidade errada de campos é rejeitado com o motivo
+    'leitura', sem interromper o arquivo, e se um arquivo vazio resulta em zero registros.
+    """
+    caminho = tmp_path / "campos.csv"
+    caminho.write_text(
+        "Empresa,Receita Anual,Dívida Total,Prazo de Pagamento (dias),Setor,Rating,Notícias Recentes\n"
+        "Empresa A,100000,50000,30,Tecnologia,A,Noticia\n"
+        "Empresa B,100000,50000,30,Tecnologia,A,Noticia,extra,extra\n"
+        "Empresa C,100000,50000,30,Tecnologia,A,Noticia\n",
+        encoding="utf-8"
+    )
+    caminho_rejeitados = tmp_path / "campos.rejeitados.csv"
+    relatorio = Parses.RelatorioArquivo(caminho=str(caminho))
+
+    empresas = Parses.carregar_dados_csv(str(caminho), relatorio, str(caminho_rejeitados))
+
+    assert [e.nome for e in empresas] == ["Empresa A", "Empresa C"]
+    assert relatorio.motivos == {"leitura": 1}
+    assert caminho_rejeitados.read_text(encoding="utf-8").splitlines()[1].startswith("2,leitura,Empresa B")
+
+    vazio = tmp_path / "vazio.csv"
+    vazio.write_text("", encoding="utf-8")
+    assert Parses.carregar_dados_csv(str(vazio)) == []
+
+
+def test_endpoint_resumo_carga(client: TestClient):
+    """Testa se o endpoint GET /carga/resumo expõe o relatório da carga de inicialização."""
+    response = client.get("/carga/resumo")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_registros"] > 0
+    assert {"registros", "rejeitados", "motivos"} <= set(data["arquivos"][0])
+
+
+# --- Bloco 6: Carteira Compartilhada entre Workers ---
+
+def test_carteira_compartilhada_troca_de_geracao(tmp_path):
+    """
+    Testa se um worker mapeia a carteira publicada pelo processo pai, busca empresas
+    pelo nome e enxerga a nova geração após uma recarga.
+    """
+    from CarteiraCompartilhada import LeitorCarteira, PublicadorCarteira
+
+    empresas = [
+        Empresa(nome=f"Empresa {i}", receita_anual=1000 * i, divida_total=500, prazo_pagamento=30,
+                setor="Tecnologia", rating="A", noticias_recentes="Tudo certo.")
+        for i in range(10)
+    ]
+    publicador = PublicadorCarteira(str(tmp_path))
+    try:
+        publicador.publicar(empresas, Parses.RelatorioCarga(total_registros=10))
+        leitor = LeitorCarteira(str(tmp_path))
+
+        assert leitor.sincronizar() is True
+        assert list(leitor.carteira) == empresas
+        assert leitor.carteira.buscar("Empresa 3") == empresas[3]
+        assert leitor.carteira.buscar("Empresa Fantasma") is None
+        assert leitor.relatorio.total_registros == 10
+        assert leitor.sincronizar() is False  # Nada mudou desde a última leitura.
+
+        publicador.publicar(empresas[:4])
+        assert leitor.sincronizar() is True
+        assert len(leitor.carteira) == 4
+    finally:
+        publicador.encerrar()
+
+
+def test_endpoint_exportar_recusa_analises_no_modo_multi_worker(client: TestClient, tmp_path, monkeypatch):
+    """
+    Testa se, com a carteira compartilhada, a listagem de nomes e a exportação funcionam,
+    mas a exportação recusa incluir as análises, que ficam na memória de cada worker.
+    """
+    from CarteiraCompartilhada import LeitorCarteira, PublicadorCarteira
+
+    empresas = [
+        Empresa(nome=f"Empresa {i}", receita_anual=1000 * i, divida_total=500, prazo_pagamento=30,
+                setor="Tecnologia", rating="A", noticias_recentes="Tudo certo.")
+        for i in range(3)
+    ]
+    publicador = PublicadorCarteira(str(tmp_path))
+    try:
+        publicador.publicar(empresas)
+        monkeypatch.setattr(client.app.state, "lista_empresas", [])
+        monkeypatch.setattr(client.app.state, "leitor_carteira", LeitorCarteira(str(tmp_path)))
+
+        response = client.get("/exportar", params={"formato": "ndjson"})
+        assert response.status_code == 200
+        assert len(response.text.splitlines()) == 3
+        assert client.get("/empresas").json() == {"nomes": ["Empresa 0", "Empresa 1", "Empresa 2"]}
+
+        response = client.get("/exportar", params={"incluir_analises": True})
+        assert response.status_code == 400
+    finally:
+        publicador.encerrar()
+
+
+# --- Bloco 7: Simulação Incremental ---
+
+def test_score_local_e_faixas():
+    """Testa se o score local separa perfis sólidos e arriscados em faixas de recomendação distintas."""
+    from Simulacao import calcular_score_local, faixa_de_recomendacao
+
+    solida = Empresa(nome="Solida", receita_anual=100000, divida_total=20000, prazo_pagamento=30,
+                     setor="Tecnologia", rating="A+", noticias_recentes="")
+    arriscada = Empresa(nome="Arriscada", receita_anual=100000, divida_total=200000, prazo_pagamento=120,
+                        setor="Varejo", rating="D", noticias_recentes="")
+
+    assert calcular_score_local(solida) == 100.0
+    assert calcular_score_local(arriscada) == 0.0
+    assert faixa_de_recomendacao(calcular_score_local(solida)) == "Aprovar Credito"
+    assert faixa_de_recomendacao(calcular_score_local(arriscada)) == "Recusar Credito"
+
+
+def test_endpoint_simular_reutiliza_cenarios_na_mesma_faixa(client: TestClient, monkeypatch):
+    """
+    Testa se o endpoint POST /simular reaproveita a análise de um cenário próximo
+    na mesma faixa de recomendação e só chama a IA (de forma incremental, focada
+    no que mudou) quando o cenário cruza uma fronteira de decisão.
+    """
+    import main
+
+    chamadas = []
+    monkeypatch.setattr(main, "gerar_analise_de_credito",
+                        lambda empresa: chamadas.append("completa") or "Recomendacao Preliminar: Aprovar Credito")
+    monkeypatch.setattr(main, "gerar_analise_incremental",
+                        lambda empresa, anterior, diferencas: chamadas.append(diferencas) or "Recomendacao Preliminar: Recusar Credito")
+    client.app.state.lista_empresas = [
+        Empresa(nome="Empresa Simulada", receita_anual=100000, divida_total=50000, prazo_pagamento=30,
+                setor="Tecnologia", rating="A", noticias_recentes="Tudo certo.")
+    ]
+
+    def simular(alteracoes):
+        response = client.post("/simular", json={"nome_empresa": "Empresa Simulada", "alteracoes": alteracoes})
+        assert response.status_code == 200
+        return response.json()
+
+    primeira = simular({"receita_anual": 101000})
+    assert primeira["origem_analise"] == "nova_chamada"
+    assert primeira["faixa_recomendacao"] == "Aprovar Credito"
+
+    # Um pequeno ajuste na receita mantém o cenário na mesma faixa: sem nova chamada à IA.
+    segunda = simular({"receita_anual": 102000})
+    assert segunda["origem_analise"] == "reutilizada"
+    assert segunda["cenario_referencia"] == {"receita_anual": 101000}
+    assert segunda["analise_simulada"].startswith("[Analise reutilizada]")
+
+    # Rebaixar o rating cruza a fronteira de decisão: nova chamada, focada no que mudou.
+    terceira = simular({"rating": "C-", "divida_total": 150000})
+    assert terceira["origem_analise"] == "nova_chamada"
+    assert terceira["faixa_recomendacao"] == "Recusar Credito"
+    assert chamadas[0] == "completa"
+    assert chamadas[1]["rating"] == ("A", "C-")
+    assert len(chamadas) == 2
+
+    # Mudar as notícias não move o score, mas muda o contexto da análise: nova chamada.
+    quarta = simular({"receita_anual": 102000, "noticias_recentes": "Processo judicial em andamento."})
+    assert quarta["origem_analise"] == "nova_chamada"
+    assert chamadas[2]["noticias_recentes"] == ("Tudo certo.", "Processo judicial em andamento.")